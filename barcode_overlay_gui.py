@@ -1,115 +1,23 @@
-import re
-from io import BytesIO
+import multiprocessing
+import queue
+import sys
+import threading
+import time
 from pathlib import Path
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-from pypdf import PdfReader, PdfWriter, Transformation
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.utils import simpleSplit
-
-PAGE_W, PAGE_H = A4
-MARGIN = 36                  # 0.5 inch
-BARCODE_TARGET_W = 360.0     # barcode hedef genişliği (pt) ~ 12.7 cm
-GAP_BARCODE_LABEL = 14.0     # barcode altı ile etiket arası (pt)
-TOP_TEXT_FONT = ("Helvetica", 10)
-LABEL_FONT = ("Helvetica", 12)
-
-def sanitize_filename(name: str) -> str:
-    name = name.strip()
-    # Türkçe karakterleri koru, yasak karakterleri tireye çevir
-    name = re.sub(r'[\\/:"*?<>|]+', "-", name)
-    # Çoklu boşlukları tek boşluk, baş/son boşlukları kırp
-    name = re.sub(r"\s+", " ", name).strip()
-    # Çok uzun olmasın
-    return name[:120] if name else "output"
-
-def draw_base_a4_with_text_and_label(top_text: str, label_text: str, barcode_w_pt: float, barcode_h_pt: float):
-    """
-    A4 tek sayfalık bir PDF üretir: en üste TXT metni, ortada barcode alanı (şimdilik çizilmez),
-    barcode'un hemen altına etiket yazılır. Etiket konumu, barcode yerleşimine göre hesaplanır.
-    """
-    # Barcode'u sayfa ortasına yerleştireceğiz
-    x = (PAGE_W - barcode_w_pt) / 2.0
-    y = (PAGE_H - barcode_h_pt) / 2.0
-
-    # Etiket konumu: barcode altından küçük bir boşlukla
-    label_x_center = PAGE_W / 2.0
-    label_y = y - GAP_BARCODE_LABEL
-
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
-
-    # 1) Üst metin (TXT) — üstten aşağı doğru, kenarlardan MARGIN
-    font_name, font_size = TOP_TEXT_FONT
-    c.setFont(font_name, font_size)
-    available_width = PAGE_W - 2 * MARGIN
-    line_height = font_size * 1.3
-    y_text = PAGE_H - MARGIN
-
-    wrapped_lines = []
-    for paragraph in (top_text.splitlines() or [""]):
-        lines = simpleSplit(paragraph if paragraph else " ", font_name, font_size, available_width)
-        wrapped_lines.extend(lines if lines else [""])
-
-    for line in wrapped_lines:
-        if y_text - line_height < MARGIN:
-            break
-        c.drawString(MARGIN, y_text - line_height, line)
-        y_text -= line_height
-
-    # 2) Etiket (barcode altına)
-    c.setFont(LABEL_FONT[0], LABEL_FONT[1])
-    c.drawCentredString(label_x_center, label_y, label_text)
-
-    c.showPage()
-    c.save()
-    buf.seek(0)
-    return buf.read(), (x, y)
-
-def compose_final_pdf(barcode_pdf_path: Path, txt_path: Path, label_text: str, out_dir: Path = None):
-    # TXT oku
-    top_text = txt_path.read_text(encoding="utf-8", errors="replace")
-
-    # Barcode PDF ilk sayfa boyutu
-    bc_reader = PdfReader(str(barcode_pdf_path))
-    bc_page = bc_reader.pages[0]
-    bc_w = float(bc_page.mediabox.width)
-    bc_h = float(bc_page.mediabox.height)
-
-    # Ölçek: hedef genişliğe göre
-    scale = BARCODE_TARGET_W / bc_w
-    barcode_w_pt = bc_w * scale
-    barcode_h_pt = bc_h * scale
-
-    # A4 temel sayfa: üst metin + etiket (barcode henüz basılmadı)
-    base_bytes, (x, y) = draw_base_a4_with_text_and_label(top_text, label_text, barcode_w_pt, barcode_h_pt)
-
-    # Base PDF'i oku ve barcode sayfasını A4'e ortala + ölçekle
-    base_reader = PdfReader(BytesIO(base_bytes))
-    base_page = base_reader.pages[0]
-
-    # Barcode'u (ölçeklenmiş) A4'e yerleştir
-    t = Transformation().scale(scale).translate(x, y)
-    base_page.merge_transformed_page(bc_page, t)
-
-    writer = PdfWriter()
-    writer.add_page(base_page)
-
-    # Çıktı dosya adı: label_text (sanitize)
-    out_name = sanitize_filename(label_text) + ".pdf"
-    target_dir = out_dir if out_dir else barcode_pdf_path.parent
-    out_path = target_dir / out_name
-
-    with open(out_path, "wb") as f:
-        writer.write(f)
-
-    return out_path
+def __getattr__(name):
+    # Eski betikler için: `from barcode_overlay_gui import compose_final_pdf` çalışmaya devam eder
+    import lsmaker
+    return getattr(lsmaker, name)
 
 # -------------------- GUI --------------------
 
 class App(tk.Tk):
+    POLL_MS = 50              # kuyruk yoklama aralığı
+    STATUS_INTERVAL = 0.1     # işçinin ilerleme bildirme aralığı (sn)
+
     def __init__(self):
         super().__init__()
         self.title("A4 PDF Composer: Top Text + Center Barcode + Label")
@@ -124,6 +32,12 @@ class App(tk.Tk):
         self.txt_file = tk.StringVar()
         self.out_dir = tk.StringVar()
         self.label_text = tk.StringVar()
+        self.manifest = tk.StringVar()
+
+        # Arka plan işi: işçi iş parçacığı -> kuyruk -> after() ile olay döngüsü
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._worker = None
 
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
@@ -163,14 +77,29 @@ class App(tk.Tk):
         ttk.Entry(frm, textvariable=self.out_dir).grid(row=3, column=1, sticky="we", **pad)
         ttk.Button(frm, text="Seç…", command=self.pick_out_dir).grid(row=3, column=2, **pad)
 
+        # Manifest veya klasör (opsiyonel): verilirse yukarıdaki tek etiket alanları yerine toplu
+        # üretim yapılır; klasörde aynı köklü PDF + TXT çiftleri eşlenir, etiket dosya adıdır
+        ttk.Label(frm, text="Manifest CSV/JSONL veya klasör (ops., toplu):").grid(row=4, column=0, sticky="w", **pad)
+        ttk.Entry(frm, textvariable=self.manifest).grid(row=4, column=1, sticky="we", **pad)
+        pickers = ttk.Frame(frm)
+        pickers.grid(row=4, column=2, **pad)
+        ttk.Button(pickers, text="Seç…", command=self.pick_manifest).grid(row=0, column=0)
+        ttk.Button(pickers, text="Klasör…", command=self.pick_scan_dir).grid(row=0, column=1, padx=(4, 0))
+
         # Aksiyonlar
         actions = ttk.Frame(frm)
-        actions.grid(row=4, column=0, columnspan=3, sticky="we", **pad)
-        ttk.Button(actions, text="PDF Oluştur", command=self.create_pdf).grid(row=0, column=0, **pad)
-        ttk.Button(actions, text="Kapat", command=self.destroy).grid(row=0, column=1, **pad)
+        actions.grid(row=5, column=0, columnspan=3, sticky="we", **pad)
+        self.create_btn = ttk.Button(actions, text="PDF Oluştur", command=self.create_pdf)
+        self.create_btn.grid(row=0, column=0, **pad)
+        self.cancel_btn = ttk.Button(actions, text="İptal", command=self.cancel_job, state="disabled")
+        self.cancel_btn.grid(row=0, column=1, **pad)
+        ttk.Button(actions, text="Kapat", command=self.destroy).grid(row=0, column=2, **pad)
+
+        self.progress = ttk.Progressbar(frm, mode="determinate", maximum=1)
+        self.progress.grid(row=6, column=0, columnspan=3, sticky="we", padx=12, pady=(4, 0))
 
         self.status = ttk.Label(frm, text="A4 sayfa: üstte TXT, ortada barcode, altında etiket. Dosya adı = etiket.")
-        self.status.grid(row=5, column=0, columnspan=3, sticky="w", padx=12, pady=(4, 0))
+        self.status.grid(row=7, column=0, columnspan=3, sticky="w", padx=12, pady=(4, 0))
 
     def pick_pdf(self):
         p = filedialog.askopenfilename(title="Barcode PDF seç", filetypes=[("PDF", "*.pdf"), ("Tümü", "*.*")])
@@ -184,8 +113,27 @@ class App(tk.Tk):
         p = filedialog.askdirectory(title="Çıktı klasörü seç")
         if p: self.out_dir.set(p)
 
+    def pick_manifest(self):
+        p = filedialog.askopenfilename(title="Manifest seç",
+                                       filetypes=[("Manifest", "*.csv *.jsonl *.ndjson"), ("Tümü", "*.*")])
+        if p: self.manifest.set(p)
+
+    def pick_scan_dir(self):
+        p = filedialog.askdirectory(title="PDF + TXT çiftlerinin bulunduğu klasörü seç")
+        if p: self.manifest.set(p)
+
     def create_pdf(self):
-        try:
+        if self._worker is not None:
+            return
+        out_dir = Path(self.out_dir.get().strip()) if self.out_dir.get().strip() else None
+        manifest = self.manifest.get().strip()
+
+        if manifest:
+            if not Path(manifest).exists():
+                messagebox.showerror("Hata", "Geçerli bir manifest dosyası veya klasör seçin.")
+                return
+            job = (self._run_manifest, (Path(manifest), out_dir))
+        else:
             src = self.src_pdf.get().strip()
             txt = self.txt_file.get().strip()
             label = self.label_text.get().strip()
@@ -199,15 +147,116 @@ class App(tk.Tk):
             if not label:
                 messagebox.showerror("Hata", "Etiket metni zorunludur (dosya adı olarak kullanılacak).")
                 return
+            job = (self._run_single, (Path(src), Path(txt), label, out_dir))
+
+        self._cancel.clear()
+        self.create_btn.configure(state="disabled")
+        # Tek etiket tek adımda biter; iptal yalnızca manifest / klasör işleri satır arasında denetlenir
+        self.cancel_btn.configure(state="normal" if manifest else "disabled")
+        self.progress.configure(value=0, maximum=1)
+        self.status.configure(text="Hazırlanıyor…")
+
+        fn, args = job
+        self._worker = threading.Thread(target=self._work, args=(fn, args), daemon=True)
+        self._worker.start()
+        self.after(self.POLL_MS, self._poll)
+
+    def cancel_job(self):
+        self._cancel.set()
+        self.cancel_btn.configure(state="disabled")
+        self.status.configure(text="İptal ediliyor…")
 
-            out_dir = Path(self.out_dir.get().strip()) if self.out_dir.get().strip() else None
-            out_path = compose_final_pdf(Path(src), Path(txt), label, out_dir)
-            self.status.configure(text=f"✅ Oluşturuldu: {out_path}")
-            messagebox.showinfo("Başarılı", f"PDF oluşturuldu:\n{out_path}")
+    # ---- İşçi iş parçacığı: Tk nesnelerine dokunmaz, yalnızca kuyruğa yazar ----
+
+    def _work(self, fn, args):
+        try:
+            fn(*args)
         except Exception as e:
-            self.status.configure(text=f"Hata: {e}")
-            messagebox.showerror("Hata", f"PDF oluşturulamadı:\n{e}")
+            self._queue.put(("error", str(e)))
+
+    def _run_single(self, src: Path, txt: Path, label: str, out_dir: Path):
+        # pypdf/reportlab ilk PDF oluşturulurken yüklenir; pencere bunları beklemeden açılır
+        from lsmaker.compose import compose_final_pdf
+
+        out_path = compose_final_pdf(src, txt, label, out_dir)
+        self._queue.put(("progress", 1, 1, str(out_path)))
+        self._queue.put(("done", f"✅ Oluşturuldu: {out_path}", f"PDF oluşturuldu:\n{out_path}"))
+
+    def _run_manifest(self, manifest: Path, out_dir: Path):
+        from lsmaker.batch import assign_output_names, run_batch
+        from lsmaker.manifest import read_manifest
+        from lsmaker.scan import scan_pairs
+
+        if manifest.is_dir():
+            # Çıktılar kaynak PDF'lerin üzerine düşmesin (etiket = dosya kökü)
+            out_dir = out_dir or manifest / "_out"
+            rows = scan_pairs(manifest, exclude=(out_dir,)).rows
+        else:
+            rows = read_manifest(manifest)
+        rows = list(assign_output_names(rows, out_dir))
+        total = len(rows)
+        done = failed = 0
+        last_report = 0.0
+        for result in run_batch(rows, out_dir):
+            done += 1
+            if result.error:
+                failed += 1
+            # Durum güncellemesi seyreltilir: binlerce satırda olay döngüsü boğulmasın
+            now = time.monotonic()
+            if now - last_report >= self.STATUS_INTERVAL or done == total:
+                last_report = now
+                self._queue.put(("progress", done, total, result.row.label))
+            if self._cancel.is_set():
+                break
+
+        summary = f"{done - failed} başarılı, {failed} hatalı"
+        if done < total:
+            self._queue.put(("cancelled", f"İptal edildi: {done}/{total} satır işlendi ({summary})."))
+        else:
+            self._queue.put(("done", f"✅ Toplu üretim bitti: {summary}.",
+                             f"{total} satır işlendi:\n{summary}."))
+
+    # ---- Olay döngüsü tarafı ----
+
+    def _poll(self):
+        progress = None
+        finished = None
+        while True:
+            try:
+                msg = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if msg[0] == "progress":
+                progress = msg     # yalnızca en sonuncusu ekrana yansır
+            else:
+                finished = msg
+
+        if progress is not None:
+            _, done, total, text = progress
+            self.progress.configure(maximum=max(total, 1), value=done)
+            self.status.configure(text=f"{done}/{total} — {text}")
+
+        if finished is None:
+            self.after(self.POLL_MS, self._poll)
+            return
+
+        self._worker = None
+        self.create_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+        kind = finished[0]
+        if kind == "done":
+            self.status.configure(text=finished[1])
+            messagebox.showinfo("Başarılı", finished[2])
+        elif kind == "cancelled":
+            self.status.configure(text=finished[1])
+        else:
+            self.status.configure(text=f"Hata: {finished[1]}")
+            messagebox.showerror("Hata", f"PDF oluşturulamadı:\n{finished[1]}")
 
 if __name__ == "__main__":
+    # PyInstaller ile paketlenmiş exe'de işçi süreçlerin tekrar GUI açmaması için
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1:
+        from lsmaker.cli import main
+        sys.exit(main())
     App().mainloop()
-
@@ -0,0 +1,171 @@
+"""
+Ölçümler için sentetik, tekrarlanabilir girdi üreticisi:
+
+  * barcode PDF'leri: çubuk/yol sayısı, gömülü raster görüntüler, sıkıştırılmış veya
+    sıkıştırılmamış içerik akışı, alışılmadık (ve orijini kaydırılmış) mediabox boyutları
+  * TXT dosyaları: paragraf sayısı ve Türkçe karakter yoğunluğu ayarlanabilir
+  * istenen büyüklükte CSV/JSONL manifestler
+
+Aynı tohum (seed) her makinede bayt bayt aynı dosyaları üretir (reportlab invariant modu).
+
+    python benchmarks/corpus.py /tmp/korpus --seed 42 --rows 10000
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+from pathlib import Path
+
+_WORDS = (
+    "koli palet sevkiyat ürün depo raf adres miktar ağırlık tarih parti seri numara müşteri "
+    "sipariş teslimat kontrol etiket barkod lojistik stok giriş çıkış iade hasar uyarı dikkat "
+    "kırılabilir yukarı saklama koşulu sıcaklık nem üretici menşei lot son kullanma"
+).split()
+_TR_MAP = {"c": "ç", "g": "ğ", "i": "ı", "o": "ö", "s": "ş", "u": "ü",
+           "C": "Ç", "G": "Ğ", "I": "İ", "O": "Ö", "S": "Ş", "U": "Ü"}
+
+def make_barcode_pdf(path: Path, rng: random.Random, bars: int = 60, curves: int = 0, images: int = 0,
+                     compress: bool = True, size: tuple = (300.0, 120.0), origin: tuple = (0.0, 0.0)) -> Path:
+    """
+    `bars` dolu dikdörtgen, `curves` bezier yolu ve `images` adet gri tonlu gürültü görüntüsü
+    içeren tek sayfalık bir PDF yazar. `origin` sıfırdan farklıysa mediabox kaydırılır.
+    """
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+
+    w, h = size
+    ox, oy = origin
+    c = canvas.Canvas(str(path), pagesize=(w + ox, h + oy), pageCompression=1 if compress else 0,
+                      invariant=1)
+    c.translate(ox, oy)
+
+    # Çubuklar: gerçek barcode'lar gibi soldan sağa, değişken genişlikte
+    x = w * 0.05
+    step = (w * 0.9) / max(bars, 1)
+    for _ in range(bars):
+        bw = step * rng.choice((0.25, 0.5, 0.75))
+        c.rect(x, h * 0.15, bw, h * 0.7, fill=1, stroke=0)
+        x += step
+
+    for _ in range(curves):
+        p = c.beginPath()
+        p.moveTo(rng.uniform(0, w), rng.uniform(0, h))
+        p.curveTo(*(rng.uniform(0, w) if i % 2 == 0 else rng.uniform(0, h) for i in range(6)))
+        c.drawPath(p, stroke=1, fill=0)
+
+    if images:
+        from PIL import Image
+
+        for _ in range(images):
+            iw, ih = rng.randint(16, 128), rng.randint(16, 128)
+            img = Image.frombytes("L", (iw, ih), rng.randbytes(iw * ih))
+            c.drawImage(ImageReader(img), rng.uniform(0, w * 0.8), rng.uniform(0, h * 0.8),
+                        width=iw / 4, height=ih / 4)
+
+    c.setFont("Helvetica", 8)
+    c.drawString(w * 0.05, h * 0.04, f"{rng.randrange(10**12):012d}")
+    c.showPage()
+    c.save()
+
+    if ox or oy:
+        from pypdf import PdfReader, PdfWriter
+
+        writer = PdfWriter(clone_from=PdfReader(str(path)))
+        page = writer.pages[0]
+        page.mediabox.lower_left = (ox, oy)
+        page.mediabox.upper_right = (ox + w, oy + h)
+        writer._ID = None
+        with open(path, "wb") as f:
+            writer.write(f)
+    return path
+
+def make_txt(path: Path, rng: random.Random, paragraphs: int = 20, words: int = 40,
+             turkish_density: float = 0.3) -> Path:
+    """`turkish_density`: uygun harflerin Türkçe karşılığına çevrilme olasılığı (0..1)."""
+    out = []
+    for _ in range(paragraphs):
+        text = " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+        out.append("".join(_TR_MAP[ch] if ch in _TR_MAP and rng.random() < turkish_density else ch
+                           for ch in text) + ".")
+    path.write_text("\n".join(out) + "\n", encoding="utf-8")
+    return path
+
+def make_manifest(path: Path, rng: random.Random, rows: int, barcodes: list, txts: list) -> Path:
+    """Uzantı .jsonl ise JSONL, değilse CSV manifest yazar; yollar manifeste göreli yazılır."""
+    def rel(p: Path) -> str:
+        try:
+            return str(p.relative_to(path.parent))
+        except ValueError:
+            return str(p)
+
+    records = ({"barcode_pdf": rel(rng.choice(barcodes)), "txt": rel(rng.choice(txts)),
+                "label": f"ETİKET-{i:06d}-{rng.randrange(10**6):06d}"} for i in range(rows))
+    if path.suffix.lower() == ".jsonl":
+        with open(path, "w", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=("barcode_pdf", "txt", "label"))
+            writer.writeheader()
+            writer.writerows(records)
+    return path
+
+# Hazır barcode profilleri: ad -> make_barcode_pdf parametreleri
+BARCODE_PROFILES = {
+    "simple": dict(bars=30),
+    "dense": dict(bars=400, curves=200),
+    "complex": dict(bars=3000, curves=1000),
+    "raster": dict(bars=60, images=8),
+    "uncompressed": dict(bars=400, compress=False),
+    "odd_mediabox": dict(bars=80, size=(211.7, 73.3), origin=(17.0, 9.5)),
+}
+
+# Hazır TXT profilleri: ad -> make_txt parametreleri
+TXT_PROFILES = {
+    "small": dict(paragraphs=3, words=15),
+    "medium": dict(paragraphs=60, words=40),
+    "huge": dict(paragraphs=50_000, words=40),
+    "turkish_heavy": dict(paragraphs=60, words=40, turkish_density=1.0),
+}
+
+def generate_corpus(out_dir: Path, seed: int = 0, rows: int = 1000, barcodes: list = None,
+                    txts: list = None, manifest_format: str = "csv") -> dict:
+    """Tüm profilleri üretir; üretilen dosyaların yollarını sözlük olarak döner."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result = {"barcodes": {}, "txts": {}}
+    for name in barcodes or BARCODE_PROFILES:
+        # Her dosyanın kendi tohumu: bir profili atlamak diğerlerinin içeriğini değiştirmez
+        rng = random.Random(f"{seed}:barcode:{name}")
+        result["barcodes"][name] = make_barcode_pdf(out_dir / f"barcode_{name}.pdf", rng, **BARCODE_PROFILES[name])
+    for name in txts or TXT_PROFILES:
+        rng = random.Random(f"{seed}:txt:{name}")
+        result["txts"][name] = make_txt(out_dir / f"top_{name}.txt", rng, **TXT_PROFILES[name])
+    if rows:
+        rng = random.Random(f"{seed}:manifest")
+        result["manifest"] = make_manifest(out_dir / f"manifest.{manifest_format}", rng, rows,
+                                           list(result["barcodes"].values()), list(result["txts"].values()))
+    return result
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="LsMaker ölçüm girdisi üreticisi")
+    ap.add_argument("out_dir", type=Path)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--rows", type=int, default=1000, help="Manifest satır sayısı (0 = manifest yok)")
+    ap.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    ap.add_argument("--barcodes", nargs="*", choices=sorted(BARCODE_PROFILES), default=None)
+    ap.add_argument("--txts", nargs="*", choices=sorted(TXT_PROFILES), default=None)
+    args = ap.parse_args(argv)
+
+    result = generate_corpus(args.out_dir, args.seed, args.rows, args.barcodes, args.txts, args.format)
+    for group in ("barcodes", "txts"):
+        for name, p in result[group].items():
+            print(f"{group[:-1]:<8} {name:<14} {p}")
+    if "manifest" in result:
+        print(f"manifest {args.rows} satır     {result['manifest']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+LsMaker performans ölçümleri. Bağımsız çalışır (pytest gerektirmez):
+
+    python benchmarks/run_benchmarks.py --out sonuc.json
+    python benchmarks/run_benchmarks.py --quick --filter compose
+    python benchmarks/run_benchmarks.py --out yeni.json --compare eski.json
+
+Sonuçlar JSON olarak yazılır; --compare ile önceki bir çalıştırmaya göre oranlar basılır.
+"cold" ölçümler her turda süreç içi önbellekleri temizler, "warm" ölçümler temizlemez.
+Girdiler corpus.py ile verilen tohumdan (--seed) üretilir.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import lsmaker  # noqa: E402
+from lsmaker import batch, compose  # noqa: E402
+from lsmaker.manifest import ManifestRow  # noqa: E402
+
+from corpus import generate_corpus  # noqa: E402
+
+# -------------------- Girdiler --------------------
+
+TXT_SIZES = ("small", "medium", "huge")
+
+def _make_inputs(root: Path, seed: int, quick: bool) -> dict:
+    txts = [t for t in TXT_SIZES if not (quick and t == "huge")]
+    corpus = generate_corpus(root, seed=seed, rows=0, barcodes=["simple", "complex"], txts=txts)
+    paths = {f"barcode_{name}": p for name, p in corpus["barcodes"].items()}
+    paths.update({f"txt_{name}": p for name, p in corpus["txts"].items()})
+    return paths
+
+def _clear_caches():
+    compose.barcode_cache.clear()
+    compose._wrap_cache.clear()
+    compose._top_text_ops.cache_clear()
+
+# -------------------- Ölçüm --------------------
+
+def _measure(fn, setup=None, min_time: float = 0.5, max_rounds: int = 1000, min_rounds: int = 3) -> dict:
+    times = []
+    deadline = time.perf_counter() + min_time
+    while len(times) < max_rounds and (len(times) < min_rounds or time.perf_counter() < deadline):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    mean = statistics.fmean(times)
+    return {
+        "rounds": len(times),
+        "mean": mean,
+        "median": statistics.median(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "min": min(times),
+        "ops_per_sec": 1.0 / mean if mean else None,
+    }
+
+def _benchmarks(paths: dict, out_dir: Path, quick: bool):
+    """(ad, parametreler, çağrı, hazırlık) dörtlüleri üretir."""
+    yield ("sanitize_filename", {}, lambda: compose.sanitize_filename(' Koli: 12/ÇŞ  "A"*B?  '), None)
+
+    for size in TXT_SIZES:
+        if quick and size == "huge":
+            continue
+        text = paths[f"txt_{size}"].read_text(encoding="utf-8")
+        call = (lambda t=text: compose.draw_base_a4_with_text_and_label(t, "ETIKET-0001", 360.0, 144.0))
+        yield ("draw_base_a4_with_text_and_label", {"txt": size, "cache": "cold"}, call, _clear_caches)
+        yield ("draw_base_a4_with_text_and_label", {"txt": size, "cache": "warm"}, call, None)
+
+    for kind in ("simple", "complex"):
+        bc = paths[f"barcode_{kind}"]
+        call = (lambda b=bc: compose.compose_final_pdf(b, paths["txt_medium"], "ETIKET-0001", out_dir))
+        yield ("compose_final_pdf", {"barcode": kind, "cache": "cold"}, call, _clear_caches)
+        yield ("compose_final_pdf", {"barcode": kind, "cache": "warm"}, call, None)
+
+    rows_n = 40 if quick else 400
+    rows = [ManifestRow(i, paths["barcode_complex" if i % 2 else "barcode_simple"], paths["txt_medium"],
+                        f"ETIKET-{i:05d}", out_dir) for i in range(rows_n)]
+    cpu = os.cpu_count() or 1
+    for workers in sorted({1, cpu}):
+        if workers == 1:
+            call = (lambda: list(batch.run_batch(rows)))
+        else:
+            call = (lambda w=workers: list(batch.run_batch_parallel(rows, workers=w, chunksize=8)))
+        yield ("batch_throughput", {"rows": rows_n, "workers": workers}, call, _clear_caches)
+
+def _label(name: str, params: dict) -> str:
+    return name + ("[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]" if params else "")
+
+def run(quick: bool = False, name_filter: str = None, min_time: float = 0.5, seed: int = 0) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory(prefix="lsmaker-bench-") as tmp:
+        root = Path(tmp)
+        out_dir = root / "out"
+        out_dir.mkdir()
+        paths = _make_inputs(root, seed, quick)
+        for name, params, fn, setup in _benchmarks(paths, out_dir, quick):
+            label = _label(name, params)
+            if name_filter and name_filter not in label:
+                continue
+            # Toplu iş ölçümleri uzun sürer; tur sayısı düşük tutulur
+            heavy = name == "batch_throughput"
+            stats = _measure(fn, setup, min_time=min_time, max_rounds=3 if heavy else 1000,
+                             min_rounds=1 if heavy else 3)
+            if heavy:
+                stats["rows_per_sec"] = params["rows"] / stats["mean"]
+            results.append({"name": name, "params": params, **stats})
+            print(f"{label:<70} {stats['mean'] * 1000:10.3f} ms  ({stats['rounds']} tur)", file=sys.stderr)
+
+    return {
+        "meta": {
+            "lsmaker_version": lsmaker.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "quick": quick,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+def compare(new: dict, old: dict):
+    old_by_label = {_label(r["name"], r["params"]): r for r in old["results"]}
+    print(f"{'ölçüm':<70} {'eski ms':>10} {'yeni ms':>10} {'oran':>7}")
+    for r in new["results"]:
+        label = _label(r["name"], r["params"])
+        prev = old_by_label.get(label)
+        if prev is None:
+            continue
+        ratio = r["mean"] / prev["mean"] if prev["mean"] else float("nan")
+        print(f"{label:<70} {prev['mean'] * 1000:10.3f} {r['mean'] * 1000:10.3f} {ratio:7.2f}x")
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="LsMaker performans ölçümleri")
+    ap.add_argument("--out", type=Path, help="Sonuçların yazılacağı JSON dosyası")
+    ap.add_argument("--compare", type=Path, help="Karşılaştırılacak önceki sonuç JSON'u")
+    ap.add_argument("--filter", help="Yalnızca adı bu metni içeren ölçümleri çalıştır")
+    ap.add_argument("--quick", action="store_true", help="Büyük girdileri atla, kısa çalıştır")
+    ap.add_argument("--seed", type=int, default=0, help="Girdi üreticisinin tohumu")
+    ap.add_argument("--min-time", type=float, default=0.5, help="Ölçüm başına en az süre (sn)")
+    args = ap.parse_args(argv)
+
+    report = run(quick=args.quick, name_filter=args.filter, min_time=args.min_time, seed=args.seed)
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding="utf-8")))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+LsMaker: A4 etiket PDF'i oluşturma motoru (üst metin + ortada barcode + altında etiket).
+
+Alt modüller ilk kullanımda yüklenir; `import lsmaker` pypdf/reportlab'ı içe aktarmaz.
+"""
+import importlib
+
+__version__ = "1.0.0"
+
+# ad -> tanımlandığı alt modül
+_EXPORTS = {
+    "PAGE_W": "compose",
+    "PAGE_H": "compose",
+    "MARGIN": "compose",
+    "BARCODE_TARGET_W": "compose",
+    "GAP_BARCODE_LABEL": "compose",
+    "TOP_TEXT_FONT": "compose",
+    "LABEL_FONT": "compose",
+    "BarcodeCache": "compose",
+    "BarcodeTemplate": "compose",
+    "barcode_cache": "compose",
+    "compose_final_pdf": "compose",
+    "compose_native_pdf": "compose",
+    "compose_pdf_bytes": "compose",
+    "compose_to_stream": "compose",
+    "draw_base_a4_with_text_and_label": "compose",
+    "read_top_text_lines": "compose",
+    "sanitize_filename": "naming",
+    "wrap_top_text": "compose",
+    "write_pdf": "compose",
+    "set_deterministic": "compose",
+    "SYMBOLOGIES": "symbology",
+    "BarcodeSymbol": "symbology",
+    "encode_symbol": "symbology",
+    "BatchResult": "manifest",
+    "ManifestRow": "manifest",
+    "read_manifest": "manifest",
+    "ComposeStats": "timing",
+    "add_stats_hook": "timing",
+    "remove_stats_hook": "timing",
+    "enable_timing_log": "timing",
+    "Imposition": "impose",
+    "parse_imposition": "impose",
+    "CellLayout": "impose",
+    "cell_layout": "impose",
+    "OutputCache": "outcache",
+    "StreamingPdfWriter": "pdfstream",
+    "BatchJournal": "journal",
+    "ScanResult": "scan",
+    "scan_pairs": "scan",
+    "NameAllocator": "naming",
+    "NameTemplate": "naming",
+    "assign_output_names": "batch",
+    "DocumentSink": "batch",
+    "compose_document": "batch",
+    "run_batch": "batch",
+    "run_batch_parallel": "batch",
+    "run_batch_cached": "batch",
+}
+
+__all__ = ["__version__", *_EXPORTS]
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(__all__)
@@ -0,0 +1,10 @@
+import multiprocessing
+import sys
+
+# Mutlak içe aktarma: PyInstaller bu dosyayı paket dışında betik olarak çalıştırır
+from lsmaker.cli import main
+
+if __name__ == "__main__":
+    # PyInstaller ile paketlenmiş exe'de işçi süreçlerin komut satırını tekrar çalıştırmaması için
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,475 @@
+"""
+Toplu üretim: tek süreçte sıralı, süreç havuzuyla paralel ve tek belge (çok sayfalı) çıktı.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from pypdf import PageObject, PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, FloatObject, NameObject
+
+from .compose import (
+    BarcodeTemplate, _compose_base, _compose_cell_base, _compose_cell_page, _compose_native_cell,
+    _compose_native_page, _compose_page, _fixed_metadata, _page_bytes,
+    atomic_output, barcode_cache, compose_final_pdf, compose_native_pdf, output_path, read_top_text_lines,
+    sanitize_filename, write_pdf,
+)
+from .impose import SHEET_H, SHEET_W, Imposition
+from .journal import row_identity
+from .manifest import BatchResult, ManifestRow
+from .naming import NameAllocator, NameTemplate
+from .pdfstream import StreamingPdfWriter
+from .timing import enable_timing_log, timing_wanted
+
+def _row_page(row: ManifestRow, cell: tuple = None):
+    # cell (genişlik, yükseklik) verilirse A4 yerine N-up hücre sayfası
+    if cell is not None:
+        if row.barcode_value is not None:
+            return _compose_native_cell(row.symbology, row.barcode_value, row.txt, row.label, cell)
+        return _compose_cell_page(barcode_cache.get(row.barcode_pdf), row.txt, row.label, cell)
+    top_lines = read_top_text_lines(row.txt)
+    if row.barcode_value is not None:
+        return _compose_native_page(row.symbology, row.barcode_value, top_lines, row.label)
+    return _compose_page(barcode_cache.get(row.barcode_pdf), top_lines, row.label)
+
+def _row_base(row: ManifestRow, cell: tuple = None) -> tuple:
+    # Paylaşılan barcode için barcode'suz sayfa: (şablon, sayfa, konum); konum A4'te (x, y),
+    # hücrede (x, y, ölçek)
+    barcode = barcode_cache.get(row.barcode_pdf)
+    if cell is not None:
+        page, position = _compose_cell_base(barcode, row.txt, row.label, cell)
+    else:
+        page, position = _compose_base(barcode, read_top_text_lines(row.txt), row.label)
+    return barcode, page, position
+
+def run_batch(rows: Iterable[ManifestRow], out_dir: Path = None) -> Iterator[BatchResult]:
+    """
+    Manifest satırlarını tek süreçte sırayla oluşturur. Aynı TXT ve aynı barcode PDF
+    satırlar arasında yalnızca bir kez okunur; barcode PDF'ler `barcode_cache` üzerinden
+    süreç boyunca yeniden kullanılır. Hatalı satır toplu işi durdurmaz.
+    """
+    for row in rows:
+        try:
+            if row.barcode_value is not None:
+                out_path = compose_native_pdf(row.symbology, row.barcode_value, row.txt, row.label,
+                                              row.out_dir or out_dir, out_name=row.out_name)
+            else:
+                out_path = compose_final_pdf(row.barcode_pdf, row.txt, row.label, row.out_dir or out_dir,
+                                             out_name=row.out_name)
+            yield BatchResult(row, out_path)
+        except Exception as e:
+            yield BatchResult(row, None, str(e))
+
+def _init_worker(cache_size: int, timing_log: bool):
+    # spawn ile başlayan süreçler üst süreçteki ayarları miras almaz
+    barcode_cache.maxsize = cache_size
+    if timing_log:
+        enable_timing_log()
+
+def _compose_chunk(rows: List[ManifestRow], out_dir: Optional[Path]) -> List[BatchResult]:
+    # İşçi süreçte çalışır; barcode_cache süreç ömrü boyunca parçalar arasında korunur
+    return list(run_batch(rows, out_dir))
+
+def _chunks(rows: Iterable[ManifestRow], size: int) -> Iterator[List[ManifestRow]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _run_chunks(fn, rows: Iterable[ManifestRow], fn_args: tuple, workers: int,
+                chunksize: int, ordered: bool) -> Iterator:
+    # fn(parça, *fn_args) işçi süreçte çalışır ve bir sonuç listesi döner
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, chunksize)
+    chunks = _chunks(rows, chunksize)
+    max_in_flight = workers * 4
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(barcode_cache.maxsize, timing_wanted())) as pool:
+        pending = deque()
+        for chunk in islice(chunks, max_in_flight):
+            pending.append(pool.submit(fn, chunk, *fn_args))
+
+        while pending:
+            if ordered:
+                done = pending.popleft()
+            else:
+                done = next(as_completed(pending))
+                pending.remove(done)
+            for chunk in islice(chunks, 1):
+                pending.append(pool.submit(fn, chunk, *fn_args))
+            yield from done.result()
+
+def run_batch_parallel(rows: Iterable[ManifestRow], out_dir: Path = None, workers: int = None,
+                       chunksize: int = 16, ordered: bool = True) -> Iterator[BatchResult]:
+    """
+    Manifest satırlarını ProcessPoolExecutor ile çekirdeklere dağıtır. Satırlar `chunksize`'lık
+    parçalar halinde gönderilir (pickle maliyeti parça başına bir kez ödenir). `ordered=True` ise
+    sonuçlar manifest sırasıyla, değilse tamamlandıkça döner. Aynı anda kuyrukta en fazla
+    workers * 4 parça tutulur; böylece çok büyük manifestlerde bellek sınırlı kalır.
+    """
+    return _run_chunks(_compose_chunk, rows, (out_dir,), workers, chunksize, ordered)
+
+def _row_target_dir(row: ManifestRow, out_dir: Optional[Path]) -> Path:
+    # compose_final_pdf / compose_native_pdf ile aynı klasör seçimi
+    return row.out_dir or out_dir or (row.txt.parent if row.barcode_pdf is None else row.barcode_pdf.parent)
+
+def _row_output_path(row: ManifestRow, out_dir: Optional[Path]) -> Path:
+    return output_path(row.label, _row_target_dir(row, out_dir), row.out_name)
+
+def assign_output_names(rows: Iterable[ManifestRow], out_dir: Path = None, allocator: NameAllocator = None,
+                        template: NameTemplate = None) -> Iterator[ManifestRow]:
+    """
+    Satırlara çıktı adlarını manifest sırasıyla (işçilere dağıtmadan önce, ana süreçte) atar;
+    aynı klasörde aynı ada düşen etiketler birbirinin üzerine yazmaz. Bkz. NameAllocator.
+    `template` verilirse ad şablondan üretilir; şablonun açtığı alt klasörler (ve eksik çıktı
+    klasörleri) burada, her klasör için bir kez oluşturulur.
+    """
+    allocator = allocator or NameAllocator()
+    created = set()
+    for row in rows:
+        relative = template.render(row) if template is not None else sanitize_filename(row.label)
+        subdir, _, stem = relative.rpartition("/")
+        folder = _row_target_dir(row, out_dir)
+        if subdir:
+            folder = folder / subdir
+        if folder not in created:
+            created.add(folder)
+            try:
+                folder.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass          # hata, satır oluşturulurken raporlanır
+        name = allocator.allocate(folder, stem, ".pdf", row_identity(row))
+        yield row._replace(out_name=f"{subdir}/{name}" if subdir else name)
+
+def run_batch_cached(rows: Iterable[ManifestRow], cache, out_dir: Path = None, workers: int = 1,
+                     chunksize: int = 16, ordered: bool = True) -> Iterator[BatchResult]:
+    """
+    run_batch / run_batch_parallel'in çıktı önbellekli (lsmaker.outcache.OutputCache) hali.
+    Anahtarı önbellekte olan satırlar oluşturulmadan `cached=True` ile döner; diğerleri
+    oluşturulur ve başarılıysa önbelleğe yazılır. Önbellek isabetleri, sıralı modda da,
+    kendisinden önceki ıskalar bitmeden raporlanabilir.
+    """
+    hits = deque()
+    keys = {}
+
+    def misses():
+        for row in rows:
+            try:
+                key = cache.key_for(row)
+            except OSError:
+                # Eksik girdi: hata mesajı oluşturma sırasında üretilsin
+                yield row
+                continue
+            restored = cache.restore(key, _row_output_path(row, out_dir))
+            if restored is not None:
+                hits.append(BatchResult(row, restored, cached=True))
+                continue
+            keys[row.index] = key
+            yield row
+
+    if workers == 1:
+        results = run_batch(misses(), out_dir)
+    else:
+        results = run_batch_parallel(misses(), out_dir, workers=workers, chunksize=chunksize, ordered=ordered)
+    for result in results:
+        while hits:
+            yield hits.popleft()
+        key = keys.pop(result.row.index, None)
+        if key is not None and result.error is None:
+            cache.store(key, result.out_path)
+        yield result
+    while hits:
+        yield hits.popleft()
+
+# -------------------- Tek belge (çok sayfalı) çıktı --------------------
+
+class DocumentSink:
+    """
+    Oluşturulan sayfaları tek bir PdfWriter'da toplar. `split_every` verilirse her N sayfada
+    bir parça dosyası (ad_0001.pdf, ad_0002.pdf, ...) yazılır ve bellek serbest bırakılır.
+
+    `add_page(page, barcode, (x, y))` ile barcode'suz temel sayfa verilirse barcode sayfası
+    belgeye bir kez Form XObject olarak gömülür ve her sayfada yalnızca `cm ... Do` ile
+    çağrılır; aynı şablonu kullanan sayfalar vektör verisini tekrar taşımaz.
+
+    `streaming=True` ise PdfWriter yerine lsmaker.pdfstream.StreamingPdfWriter kullanılır:
+    sayfalar eklendikçe diske yazılır ve bellek kullanımı sayfa sayısıyla büyümez.
+    """
+
+    _XOBJECT_NAME = NameObject("/LsBarcode")
+
+    def __init__(self, out_path: Path, split_every: int = None, streaming: bool = False):
+        self.out_path = Path(out_path)
+        self.split_every = split_every if split_every and split_every > 0 else None
+        self.streaming = streaming
+        self.paths = []
+        self._writer = None
+        self._forms = {}        # id(BarcodeTemplate) -> (şablon, writer içindeki Form XObject)
+        self._count = 0
+        self._part = 0
+
+    @property
+    def current_path(self) -> Path:
+        if self.split_every is None:
+            return self.out_path
+        return self.out_path.with_name(f"{self.out_path.stem}_{self._part:04d}{self.out_path.suffix}")
+
+    def _open(self):
+        if self._writer is None:
+            self._part += 1
+            self._count = 0
+            self._forms = {}
+            self._writer = StreamingPdfWriter(self.current_path) if self.streaming else PdfWriter()
+
+    def _add_object(self, obj):
+        if self.streaming:
+            return self._writer.add_object(obj)
+        return self._writer._add_object(obj)    # pypdf iç API'si; sürüm build-windows.yml'de sabitlenir
+
+    def _own(self, obj):
+        # PdfWriter başka belgenin nesnelerini klonlamalı; akışlı yazıcı yazarken kendisi kopyalar
+        return obj if self.streaming else obj.clone(self._writer)
+
+    def _added(self) -> Path:
+        path = self.current_path
+        self._count += 1
+        if self.split_every and self._count >= self.split_every:
+            self._flush()
+        return path
+
+    def add_page(self, page, barcode: BarcodeTemplate = None, position: tuple = None) -> Path:
+        self._open()
+        if self.streaming:
+            if barcode is not None:
+                self._place_barcode(page, barcode, position)
+            self._writer.add_page(page)
+        else:
+            written = self._writer.add_page(page)
+            if barcode is not None:
+                self._place_barcode(written, barcode, position)
+        return self._added()
+
+    def add_sheet(self, cells: list, grid: Imposition) -> Path:
+        """
+        N-up yaprak: `cells` (hücre sayfası, barcode, (x, y, ölçek)) üçlüleridir ve ızgaraya sol
+        üstten satır satır yerleştirilir. Hücre sayfaları hücre boyutunda düzenlenmiştir (bkz.
+        lsmaker.compose._compose_cell_base); her biri Form XObject olarak gömülüp hücresine
+        taşınır. Barcode verilmişse (paylaşılan barcode) hücre içinde ayrıca çağrılır.
+        """
+        self._open()
+        if self.streaming:
+            sheet = PageObject.create_blank_page(width=SHEET_W, height=SHEET_H)
+        else:
+            sheet = self._writer.add_blank_page(SHEET_W, SHEET_H)
+        xobjects = DictionaryObject()
+        ops = []
+        for i, (page, barcode, position) in enumerate(cells):
+            box = page.mediabox
+            scale, x, y = grid.cell_transform(i, float(box.width), float(box.height))
+            cell_name = NameObject(f"/LsCell{i}")
+            xobjects[cell_name] = self._page_form(page)
+            ops.append(f"q {scale:.6f} 0 0 {scale:.6f} {x:.4f} {y:.4f} cm {cell_name} Do")
+            if barcode is not None:
+                bc_name = NameObject(f"{self._XOBJECT_NAME}{i}")
+                xobjects[bc_name] = self._barcode_form(barcode)
+                bx, by, s = position
+                ops.append(f" q {s:.6f} 0 0 {s:.6f} {bx:.4f} {by:.4f} cm {bc_name} Do Q")
+            ops.append(" Q\n")
+        sheet[NameObject("/Resources")] = DictionaryObject({NameObject("/XObject"): xobjects})
+        content = DecodedStreamObject()
+        content.set_data("".join(ops).encode("ascii"))
+        self._set_contents(sheet, content.flate_encode())
+        if self.streaming:
+            self._writer.add_page(sheet)
+        return self._added()
+
+    def _page_form(self, page):
+        # Etiket sayfasının tamamı (içerik + kaynaklar) tek bir Form XObject olur
+        form = DecodedStreamObject()
+        form.set_data(page.get_contents().get_data())
+        form.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/BBox"): ArrayObject(FloatObject(v) for v in page.mediabox),
+            NameObject("/Resources"): self._own(page.get("/Resources", DictionaryObject()).get_object()),
+        })
+        return self._add_object(form.flate_encode())
+
+    def _barcode_form(self, barcode: BarcodeTemplate):
+        entry = self._forms.get(id(barcode))
+        if entry is not None:
+            return entry[1]
+        bc_page = barcode.page
+        form = DecodedStreamObject()
+        form.set_data(bc_page.get_contents().get_data())
+        form.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            # merge_transformed_page ile aynı kırpma kutusu
+            NameObject("/BBox"): ArrayObject(FloatObject(v) for v in bc_page.cropbox),
+            NameObject("/Resources"): self._own(bc_page.get("/Resources", DictionaryObject()).get_object()),
+        })
+        ref = self._add_object(form.flate_encode())
+        # Şablon nesnesi de tutulur: id() değeri sayfa ömrü boyunca başka nesneye geçemez
+        self._forms[id(barcode)] = (barcode, ref)
+        return ref
+
+    def _place_barcode(self, page, barcode: BarcodeTemplate, position: tuple):
+        x, y = position
+        s = barcode.scale
+        resources = page.setdefault(NameObject("/Resources"), DictionaryObject()).get_object()
+        xobjects = resources.setdefault(NameObject("/XObject"), DictionaryObject()).get_object()
+        xobjects[self._XOBJECT_NAME] = self._barcode_form(barcode)
+
+        content = DecodedStreamObject()
+        content.set_data(
+            b"q\n" + page.get_contents().get_data() + b"\nQ\n"
+            + f"q {s:.6f} 0 0 {s:.6f} {x:.4f} {y:.4f} cm {self._XOBJECT_NAME} Do Q\n".encode("ascii")
+        )
+        self._set_contents(page, content.flate_encode())
+
+    def _set_contents(self, page, content):
+        if self.streaming:
+            # Sayfa henüz yazılmadı; akış sayfa yazılırken dolaylı nesne olur
+            page[NameObject("/Contents")] = content
+        else:
+            page.replace_contents(content)
+
+    def _flush(self):
+        path = self.current_path
+        if self.streaming:
+            self._writer.close(_fixed_metadata())
+        else:
+            with atomic_output(path) as f:
+                write_pdf(self._writer, f)
+        self.paths.append(path)
+        self._writer = None
+        self._forms = {}
+
+    def close(self) -> List[Path]:
+        if self._writer is not None:
+            self._flush()
+        return self.paths
+
+    def abort(self) -> List[Path]:
+        """
+        Yarım kalan parçayı yazmadan atar: akışlı modda geçici dosya silinir, aksi halde bellekteki
+        PdfWriter bırakılır. Hedef dosyaya dokunulmaz; daha önce tamamlanan parçalar korunur.
+        """
+        if self._writer is not None:
+            if self.streaming:
+                self._writer.abort()
+            self._writer = None
+            self._forms = {}
+        return self.paths
+
+def _compose_chunk_pages(rows: List[ManifestRow], shared_barcodes: bool = False, cell: tuple = None) -> list:
+    # İşçi süreçte: sayfa nesneleri pickle edilemediği için tek sayfalık PDF baytları döner.
+    # shared_barcodes ise barcode'suz temel sayfa ve barcode konumu döner; barcode ana süreçte
+    # Form XObject olarak eklenir.
+    out = []
+    for row in rows:
+        try:
+            # Dahili barcode zaten birkaç dikdörtgendir; paylaşılacak PDF şablonu yoktur
+            if shared_barcodes and row.barcode_pdf is not None:
+                _, page, position = _row_base(row, cell)
+                out.append((row, _page_bytes(page), position, None))
+            else:
+                out.append((row, _page_bytes(_row_page(row, cell)), None, None))
+        except Exception as e:
+            out.append((row, None, None, str(e)))
+    return out
+
+def _document_pages(rows: Iterable[ManifestRow], shared_barcodes: bool, workers: int,
+                    chunksize: int, cell: tuple = None) -> Iterator[tuple]:
+    # (satır, sayfa, barcode, konum, hata) beşlileri, manifest sırasıyla; cell verilirse hücre sayfaları
+    if workers == 1:
+        for row in rows:
+            try:
+                if shared_barcodes and row.barcode_pdf is not None:
+                    barcode, page, position = _row_base(row, cell)
+                    yield row, page, barcode, position, None
+                else:
+                    yield row, _row_page(row, cell), None, None, None
+            except Exception as e:
+                yield row, None, None, None, str(e)
+        return
+
+    for row, data, position, error in _run_chunks(_compose_chunk_pages, rows, (shared_barcodes, cell),
+                                                  workers, chunksize, ordered=True):
+        if error:
+            yield row, None, None, None, error
+            continue
+        try:
+            page = PdfReader(BytesIO(data)).pages[0]
+            barcode = barcode_cache.get(row.barcode_pdf) if position is not None else None
+            yield row, page, barcode, position, None
+        except Exception as e:
+            yield row, None, None, None, str(e)
+
+def compose_document(rows: Iterable[ManifestRow], out_path: Path, split_every: int = None,
+                     workers: int = 1, chunksize: int = 16,
+                     shared_barcodes: bool = False, imposition: Imposition = None,
+                     streaming: bool = False) -> Iterator[BatchResult]:
+    """
+    Tüm manifesti tek bir PDF'e (veya her `split_every` sayfada bir parçaya) yazar; sayfa
+    sırası manifest sırasıdır. Her sonuçtaki out_path, satırın düştüğü belge dosyasıdır.
+    `shared_barcodes=True` ise her farklı barcode sayfası belge başına bir kez Form XObject
+    olarak gömülür. `imposition` verilirse etiketler yaprak başına satır x sütun ızgarasına
+    dizilir ve her hücre hücre boyutuna göre yeniden düzenlenir (split_every bu durumda
+    yaprak sayısıdır); bir yaprağın sonuçları yaprak tamamlandığında döner. `streaming=True`
+    ise sayfalar üretildikçe diske yazılır (bkz. DocumentSink). Dosyalar ancak üreteç sonuna
+    kadar tüketildiğinde tamamlanır; hata, kesme veya yarıda bırakılan üreteçte yarım parça
+    yazılmaz (bkz. DocumentSink.abort).
+    """
+    sink = DocumentSink(out_path, split_every, streaming)
+    cell = imposition.cell_size if imposition is not None else None
+    pages = _document_pages(rows, shared_barcodes, workers, chunksize, cell)
+    try:
+        if imposition is None:
+            for row, page, barcode, position, error in pages:
+                if error:
+                    yield BatchResult(row, None, error)
+                    continue
+                try:
+                    yield BatchResult(row, sink.add_page(page, barcode, position))
+                except Exception as e:
+                    yield BatchResult(row, None, str(e))
+        else:
+            # Hatalı satırlar hücre kaplamaz, ancak sonuç sırası korunsun diye yaprakla birlikte döner
+            cells, pending = [], []
+            for row, page, barcode, position, error in pages:
+                pending.append((row, error))
+                if error:
+                    continue
+                cells.append((page, barcode, position))
+                if len(cells) >= imposition.per_sheet:
+                    yield from _sheet_results(sink, cells, imposition, pending)
+                    cells, pending = [], []
+            if pending:
+                yield from _sheet_results(sink, cells, imposition, pending)
+    except BaseException:
+        # GeneratorExit (yarıda bırakılan üreteç) ve KeyboardInterrupt dahil
+        sink.abort()
+        raise
+    sink.close()
+
+def _sheet_results(sink: DocumentSink, cells: list, grid: Imposition, pending: list) -> Iterator[BatchResult]:
+    path, sheet_error = None, None
+    if cells:
+        try:
+            path = sink.add_sheet(cells, grid)
+        except Exception as e:
+            sheet_error = str(e)
+    for row, error in pending:
+        error = error or sheet_error
+        yield BatchResult(row, None if error else path, error)
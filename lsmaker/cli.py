@@ -0,0 +1,264 @@
+"""
+LsMaker komut satırı. Ağır modüller (pypdf, reportlab) yalnızca argümanlar ve manifest
+doğrulandıktan sonra yüklenir; `--help` ve hatalı çağrılar anında döner.
+"""
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+
+from .impose import NUP_GUTTER, NUP_MARGIN, parse_imposition
+from .manifest import read_manifest
+from .naming import NameAllocator, NameTemplate
+from .scan import scan_pairs
+
+def _non_negative_int(text: str) -> int:
+    # argparse bu hatayı kullanım mesajıyla basar ve 2 koduyla çıkar
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tam sayı bekleniyor: {text!r}") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"negatif olamaz: {value}")
+    return value
+
+def _build_arg_parser():
+    ap = argparse.ArgumentParser(
+        prog="LsMaker",
+        description="Manifest ile toplu (headless) etiket PDF üretimi veya yerel HTTP servisi. "
+                    "Argümansız çalıştırılan exe arayüzü açar.",
+    )
+    mode = ap.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--manifest", type=Path,
+                      help="CSV veya JSONL manifest (sütunlar: barcode_pdf, txt, label, out_dir; barcode_pdf "
+                           "yerine barcode_value + symbology [code128, ean13, qr] verilebilir)")
+    mode.add_argument("--scan", type=Path, metavar="KLASÖR",
+                      help="Klasör ağacındaki barcode PDF'lerini aynı köklü TXT dosyalarıyla eşle; etiket "
+                           "dosya adından alınır (çıktılar --out-dir, varsayılan KLASÖR/_out)")
+    mode.add_argument("--serve", action="store_true",
+                      help="Yerel HTTP servisi olarak çalış (POST /compose)")
+    mode.add_argument("--watch", type=Path, metavar="INBOX",
+                      help="Gelen kutusunu izle; aynı adlı PDF + TXT çiftlerini geldikçe oluştur "
+                           "(çıktılar --out-dir, varsayılan INBOX/_out)")
+    ap.add_argument("--pair-regex", default=None, metavar="REGEX",
+                    help="--scan ile: dosya kökünden eşleme anahtarı ve etiket çıkaran düzenli ifade; "
+                         "(?P<key>...) anahtar, (?P<label>...) etiket (ör. '^(?P<label>[A-Z]\\d+)(?:_bc|_top)?$')")
+    ap.add_argument("--across-dirs", action="store_true",
+                    help="--scan ile: eşlemeyi klasör içinde değil tüm ağaçta yap")
+    ap.add_argument("--no-recursive", action="store_true",
+                    help="--scan ile: alt klasörlere inme")
+    ap.add_argument("--settle", type=float, default=1.0,
+                    help="--watch ile: dosya bu kadar saniye değişmezse yazımı bitmiş sayılır")
+    ap.add_argument("--poll", action="store_true",
+                    help="--watch ile: inotify yerine periyodik tarama kullan")
+    ap.add_argument("--poll-interval", type=float, default=1.0,
+                    help="--watch --poll ile: tarama aralığı (sn)")
+    ap.add_argument("--host", default=None, help="--serve ile: dinlenecek adres (varsayılan: 127.0.0.1)")
+    ap.add_argument("--port", type=int, default=None, help="--serve ile: dinlenecek port (varsayılan: 8765)")
+    ap.add_argument("--out-dir", type=Path, default=None,
+                    help="Satırda out_dir yoksa kullanılacak çıktı klasörü (varsayılan: barcode PDF klasörü)")
+    ap.add_argument("--single-pdf", type=Path, default=None,
+                    help="Tüm etiketleri manifest sırasıyla tek bir PDF'e yaz")
+    ap.add_argument("--split-every", type=int, default=None,
+                    help="--single-pdf ile: her N sayfada bir yeni parça dosyası başlat")
+    ap.add_argument("--shared-barcode", action="store_true",
+                    help="--single-pdf ile: her farklı barcode'u belgeye bir kez gömüp sayfalarda tekrar kullan")
+    ap.add_argument("--streaming", action="store_true",
+                    help="--single-pdf ile: sayfaları üretildikçe diske yaz; bellek sayfa sayısıyla büyümez")
+    ap.add_argument("--output-cache", type=Path, default=None, metavar="DB",
+                    help="Etiket başına çıktıda: içerik adresli SQLite önbelleği; girdisi değişmeyen "
+                         "satırlar yeniden oluşturulmaz")
+    ap.add_argument("--name-template", default=None, metavar="ŞABLON",
+                    help="Etiket başına çıktı adı şablonu; '/' alt klasör açar. Alanlar: label, row, index, "
+                         "barcode_stem, txt_stem, symbology, date, time (ör. '{label[:2]}/{label}_{row:06d}')")
+    ap.add_argument("--on-collision", choices=("suffix", "hash"), default="suffix",
+                    help="Aynı klasörde aynı dosya adına düşen etiketler: 'ad (2).pdf' (suffix) veya "
+                         "girdilerden türetilen 'ad-1a2b3c4d.pdf' (hash)")
+    ap.add_argument("--journal", type=Path, default=None, metavar="JSONL",
+                    help="Etiket başına çıktıda: satır durumlarını bu günlüğe yaz "
+                         "(varsayılan --resume ile: MANIFEST.journal.jsonl veya KLASÖR/.lsmaker-journal.jsonl)")
+    ap.add_argument("--resume", action="store_true",
+                    help="Günlükte tamamlanmış görünen ve çıktısı yerinde olan satırları atla")
+    ap.add_argument("--nup", metavar="SATIRxSÜTUN", default=None,
+                    help="--single-pdf ile: her A4 yaprağa ızgara halinde birden çok etiket dizer (ör. 4x2)")
+    ap.add_argument("--gutter", type=float, default=None,
+                    help="--nup ile: hücreler arası boşluk (pt, varsayılan: 9)")
+    ap.add_argument("--sheet-margin", type=float, default=None,
+                    help="--nup ile: yaprak kenar boşluğu (pt, varsayılan: 18)")
+    ap.add_argument("-j", "--workers", type=_non_negative_int, default=None,
+                    help="Paralel işçi süreç sayısı (0 = tüm çekirdekler; varsayılan: toplu işte 1, "
+                         "servis ve izleme modunda tüm çekirdekler)")
+    ap.add_argument("--chunksize", type=int, default=16,
+                    help="İşçi sürece tek seferde gönderilen satır sayısı")
+    ap.add_argument("--unordered", action="store_true",
+                    help="Sonuçları manifest sırası yerine tamamlandıkça raporla")
+    ap.add_argument("--cache-size", type=int, default=32,
+                    help="Bellekte tutulacak ayrıştırılmış barcode PDF sayısı (süreç başına)")
+    ap.add_argument("--deterministic", action="store_true",
+                    help="Aynı girdilerden bayt bayt aynı PDF üret (sabit meta veri, içerikten türetilen /ID; "
+                         "tarih için SOURCE_DATE_EPOCH kullanılır)")
+    ap.add_argument("--timings", action="store_true",
+                    help="Her etiket için aşama sürelerini JSON satırları olarak stderr'e yaz")
+    ap.add_argument("-q", "--quiet", action="store_true", help="Yalnızca hataları yaz")
+    return ap
+
+def main(argv=None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    if args.deterministic:
+        # compose.set_deterministic ile aynı; ağır compose modülü burada yüklenmez ve
+        # ortam değişkeni işçi süreçlere de geçer
+        os.environ["LSMAKER_DETERMINISTIC"] = "1"
+    if args.timings:
+        from .timing import enable_timing_log
+
+        enable_timing_log()
+    if args.serve:
+        from .server import DEFAULT_HOST, DEFAULT_PORT, run_server
+
+        return run_server(args.host or DEFAULT_HOST, args.port or DEFAULT_PORT,
+                          workers=args.workers or None, cache_size=max(1, args.cache_size))
+
+    if args.watch:
+        from .watch import WatchFolder
+
+        return WatchFolder(args.watch, args.out_dir, settle=args.settle, workers=args.workers or None,
+                           poll_interval=args.poll_interval, use_inotify=not args.poll).run()
+
+    if args.workers is None:
+        args.workers = 1
+    if args.single_pdf and (args.output_cache or args.journal or args.resume):
+        print("Hata: --output-cache, --journal ve --resume yalnızca etiket başına dosya çıktısında "
+              "kullanılabilir.", file=sys.stderr)
+        return 2
+    imposition = None
+    if args.nup:
+        if not args.single_pdf:
+            print("Hata: --nup yalnızca --single-pdf ile kullanılabilir.", file=sys.stderr)
+            return 2
+        try:
+            imposition = parse_imposition(
+                args.nup,
+                NUP_GUTTER if args.gutter is None else args.gutter,
+                NUP_MARGIN if args.sheet_margin is None else args.sheet_margin,
+            )
+        except ValueError as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return 2
+    template = None
+    if args.name_template:
+        if args.single_pdf:
+            print("Hata: --name-template yalnızca etiket başına dosya çıktısında kullanılabilir.", file=sys.stderr)
+            return 2
+        try:
+            template = NameTemplate(args.name_template)
+        except ValueError as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return 2
+    if args.scan:
+        if not args.scan.is_dir():
+            print(f"Hata: klasör bulunamadı: {args.scan}", file=sys.stderr)
+            return 2
+        if args.out_dir is None and not args.single_pdf:
+            # Etiket dosya kökünden geldiğinden çıktılar barcode PDF'lerinin yanına yazılırsa
+            # onların üzerine düşerdi
+            args.out_dir = args.scan / "_out"
+        try:
+            scan = scan_pairs(args.scan, args.pair_regex, recursive=not args.no_recursive,
+                              across_dirs=args.across_dirs, exclude=(args.out_dir,) if args.out_dir else ())
+        except re.error as e:
+            print(f"Hata: --pair-regex geçersiz: {e}", file=sys.stderr)
+            return 2
+        rows = scan.rows
+        if not args.quiet:
+            print(f"Tarama: {len(rows)} çift bulundu.", file=sys.stderr)
+        if scan.unpaired_pdfs or scan.unpaired_txts or scan.duplicates:
+            print(f"Uyarı: eşsiz {len(scan.unpaired_pdfs)} PDF, {len(scan.unpaired_txts)} TXT; "
+                  f"{len(scan.duplicates)} yinelenen anahtar atlandı.", file=sys.stderr)
+    else:
+        try:
+            rows = read_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return 2
+
+    from .batch import assign_output_names, compose_document, run_batch, run_batch_cached, run_batch_parallel
+    from .compose import barcode_cache
+
+    barcode_cache.maxsize = max(1, args.cache_size)
+    names = NameAllocator(args.on_collision)
+    if not args.single_pdf:
+        rows = list(assign_output_names(rows, args.out_dir, names, template))
+    journal = None
+    pending = rows
+    if args.journal or args.resume:
+        from .journal import BatchJournal
+
+        if args.journal:
+            journal_path = args.journal
+        elif args.scan:
+            journal_path = args.scan / ".lsmaker-journal.jsonl"
+        else:
+            journal_path = args.manifest.with_name(args.manifest.name + ".journal.jsonl")
+        try:
+            journal = BatchJournal(journal_path, resume=args.resume)
+        except (OSError, ValueError) as e:
+            print(f"Hata: günlük açılamadı: {e}", file=sys.stderr)
+            return 2
+        if args.resume:
+            pending = [row for row in rows if journal.completed(row) is None]
+
+    output_cache = None
+    if args.output_cache:
+        from .outcache import OutputCache
+
+        try:
+            output_cache = OutputCache(args.output_cache)
+        except Exception as e:
+            print(f"Hata: çıktı önbelleği açılamadı: {e}", file=sys.stderr)
+            return 2
+        results = run_batch_cached(pending, output_cache, args.out_dir, workers=args.workers,
+                                   chunksize=args.chunksize, ordered=not args.unordered)
+    elif args.single_pdf:
+        results = compose_document(rows, args.single_pdf, args.split_every,
+                                   workers=args.workers, chunksize=args.chunksize,
+                                   shared_barcodes=args.shared_barcode, imposition=imposition,
+                                   streaming=args.streaming)
+    elif args.workers == 1:
+        results = run_batch(pending, args.out_dir)
+    else:
+        results = run_batch_parallel(pending, args.out_dir, workers=args.workers or None,
+                                     chunksize=args.chunksize, ordered=not args.unordered)
+
+    failed = 0
+    try:
+        for result in results:
+            if journal is not None:
+                journal.record(result)
+            if result.error:
+                failed += 1
+                print(f"[{result.row.index + 1}/{len(rows)}] HATA {result.row.label}: {result.error}",
+                      file=sys.stderr)
+            elif not args.quiet:
+                note = " (önbellekten)" if result.cached else ""
+                print(f"[{result.row.index + 1}/{len(rows)}] {result.out_path}{note}")
+    finally:
+        if output_cache is not None:
+            output_cache.close()
+        if journal is not None:
+            journal.close()
+
+    print(f"Tamamlandı: {len(rows) - failed} başarılı, {failed} hatalı.", file=sys.stderr)
+    if names.collisions:
+        print(f"Uyarı: {names.collisions} etiket aynı dosya adına düştü; ayırt edici ek verildi.", file=sys.stderr)
+    if journal is not None and journal.resumed:
+        print(f"Devam: {journal.resumed} satır önceki çalıştırmada tamamlanmıştı, atlandı.", file=sys.stderr)
+    if output_cache is not None:
+        st = output_cache.stats()
+        print(f"Çıktı önbelleği: {st['hits']} isabet ({st['links']} bağlantı), {st['misses']} ıska.",
+              file=sys.stderr)
+    if args.workers == 1 and not args.quiet:
+        st = barcode_cache.stats()
+        print(f"Barcode önbelleği: {st['hits']} isabet, {st['misses']} ıska, {st['evictions']} çıkarma.",
+              file=sys.stderr)
+    return 1 if failed else 0
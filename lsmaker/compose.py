@@ -0,0 +1,645 @@
+"""
+Etiket sayfası oluşturma motoru: üst metin (TXT) + ortada barcode + altında etiket.
+GUI'den bağımsızdır; pypdf ve reportlab yalnızca bu modül ilk kez içe aktarıldığında yüklenir.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO, StringIO, TextIOWrapper
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+from pypdf import PageObject, PdfReader, PdfWriter, Transformation
+from pypdf.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, NumberObject,
+)
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .impose import CellLayout, cell_layout
+from .naming import sanitize_filename
+from .symbology import encode_symbol, normalize_symbology
+from .timing import NULL_STATS, ComposeStats, timing_wanted
+
+# A4, reportlab.lib.pagesizes.A4 ile birebir aynı değerler (21 x 29.7 cm)
+_CM = 72.0 / 2.54
+PAGE_W, PAGE_H = 21 * _CM, 29.7 * _CM
+MARGIN = 36                  # 0.5 inch
+BARCODE_TARGET_W = 360.0     # barcode hedef genişliği (pt) ~ 12.7 cm
+GAP_BARCODE_LABEL = 14.0     # barcode altı ile etiket arası (pt)
+LINEAR_BARCODE_H = 72.0      # dahili 1D barcode (Code128 / EAN-13) çubuk yüksekliği (pt)
+TOP_TEXT_FONT = ("Helvetica", 10)
+LABEL_FONT = ("Helvetica", 12)
+
+# Çıktıyı etkileyen düzen sabitleri; çıktı önbelleği anahtarına girer (bkz. lsmaker.outcache)
+LAYOUT_FINGERPRINT = (PAGE_W, PAGE_H, MARGIN, BARCODE_TARGET_W, GAP_BARCODE_LABEL,
+                      TOP_TEXT_FONT, LABEL_FONT, LINEAR_BARCODE_H)
+
+_wrap_cache = OrderedDict()     # (kaynak anahtarı, font, punto, genişlik[, satır sınırı]) -> sığan satırlar
+_WRAP_CACHE_SIZE = 64
+# Tek okumada alınan en uzun paragraf parçası. Bir sayfaya sığabilecek karakter sayısından
+# (~60 satır x ~300 karakter) çok büyük; daha uzun bir satır zaten sayfayı tek başına doldurur.
+_MAX_PARAGRAPH_CHARS = 64 * 1024
+
+def _max_top_lines(line_height: float) -> int:
+    # Çizim döngüsüyle birebir aynı koşul: alt MARGIN'e taşan satır basılmaz
+    n, y_text = 0, PAGE_H - MARGIN
+    while y_text - line_height >= MARGIN:
+        n += 1
+        y_text -= line_height
+    return n
+
+def iter_paragraphs(stream) -> Iterator[str]:
+    """
+    Metin akışını paragraf paragraf (str.splitlines ile aynı ayraçlarla) okur; dosyanın
+    tamamını belleğe almaz. Boş girdi tek bir boş paragraf verir.
+    """
+    empty = True
+    while True:
+        chunk = stream.readline(_MAX_PARAGRAPH_CHARS)
+        if not chunk:
+            break
+        for paragraph in (chunk.splitlines() or [""]):
+            empty = False
+            yield paragraph
+    if empty:
+        yield ""
+
+def wrap_paragraphs(paragraphs: Iterable[str], font_name: str, font_size: float,
+                    available_width: float) -> Iterator[str]:
+    # Tembel satır bölme: tüketici durduğunda kalan paragraflar hiç bölünmez
+    for paragraph in paragraphs:
+        lines = simpleSplit(paragraph if paragraph else " ", font_name, font_size, available_width)
+        yield from (lines if lines else [""])
+
+def _fit_lines(stream, font_name: str, font_size: float, available_width: float, max_lines: int = None) -> tuple:
+    if max_lines is None:
+        max_lines = _max_top_lines(font_size * 1.3)
+    wrapped = wrap_paragraphs(iter_paragraphs(stream), font_name, font_size, available_width)
+    return tuple(islice(wrapped, max_lines))
+
+def _wrap_cache_get(key):
+    lines = _wrap_cache.get(key)
+    if lines is not None:
+        _wrap_cache.move_to_end(key)
+    return lines
+
+def _wrap_cache_put(key, lines: tuple):
+    _wrap_cache[key] = lines
+    if len(_wrap_cache) > _WRAP_CACHE_SIZE:
+        _wrap_cache.popitem(last=False)
+
+def wrap_top_text(top_text: str, font_name: str, font_size: float, available_width: float) -> tuple:
+    """
+    Üst metni verilen genişliğe göre satırlara böler ve yalnızca sayfaya sığan satırları döner.
+    Sonuç (metin özeti, font, punto, genişlik) anahtarıyla önbelleğe alınır; toplu işlerde aynı
+    TXT her etikette yeniden bölünmez.
+    """
+    digest = hashlib.blake2b(top_text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    key = (digest, font_name, font_size, available_width)
+    lines = _wrap_cache_get(key)
+    if lines is None:
+        lines = _fit_lines(StringIO(top_text, newline=None), font_name, font_size, available_width)
+        _wrap_cache_put(key, lines)
+    return lines
+
+def read_top_text_lines(txt_path: Path) -> tuple:
+    """
+    TXT dosyasını akış halinde okuyup sayfa dolunca durur: bellek ve süre girdi boyutuna değil,
+    bir sayfalık metne bağlıdır. Sonuç dosyanın yol/boyut/mtime bilgisiyle önbelleğe alınır.
+    """
+    return _read_lines(txt_path, TOP_TEXT_FONT[1], PAGE_W - 2 * MARGIN)
+
+def read_cell_text_lines(txt_path: Path, layout: CellLayout) -> tuple:
+    """read_top_text_lines'ın N-up hücre karşılığı: hücre puntosu, genişliği ve satır sınırıyla."""
+    return _read_lines(txt_path, layout.text_size, layout.text_width, layout.max_lines)
+
+def _read_lines(txt_path: Path, font_size: float, available_width: float, max_lines: int = None) -> tuple:
+    font_name = TOP_TEXT_FONT[0]
+    path = os.path.abspath(txt_path)
+    st = os.stat(path)
+    key = (("file", path, st.st_size, st.st_mtime_ns), font_name, font_size, available_width, max_lines)
+    lines = _wrap_cache_get(key)
+    if lines is None:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = _fit_lines(f, font_name, font_size, available_width, max_lines)
+        _wrap_cache_put(key, lines)
+    return lines
+
+def draw_base_a4_with_text_and_label(top_text: str, label_text: str, barcode_w_pt: float, barcode_h_pt: float):
+    """
+    A4 tek sayfalık bir PDF üretir: en üste TXT metni, ortada barcode alanı (şimdilik çizilmez),
+    barcode'un hemen altına etiket yazılır. Etiket konumu, barcode yerleşimine göre hesaplanır.
+    """
+    font_name, font_size = TOP_TEXT_FONT
+    lines = wrap_top_text(top_text, font_name, font_size, PAGE_W - 2 * MARGIN)
+    page, (x, y) = _build_base_page(lines, label_text, barcode_w_pt, barcode_h_pt)
+    return _page_bytes(page), (x, y)
+
+# -------------------- Doğrudan içerik akışı --------------------
+#
+# Temel sayfa reportlab ile PDF'e yazılıp pypdf ile tekrar okunmak yerine, içerik akışı ve
+# kaynak sözlüğü doğrudan pypdf nesneleri olarak kurulur. reportlab yalnızca metrikler
+# (satır bölme, genişlik) için kullanılır.
+#
+# Standart Helvetica WinAnsi kodlamasında ğ/Ğ/ş/Ş/ı/İ yoktur; reportlab bunları ZapfDingbats
+# kutularıyla basıyordu. cp1254 (Windows Türkçe) WinAnsi'den yalnızca bu altı kodda ayrılır,
+# bu yüzden metin cp1254 ile kodlanır ve font kodlamasına /Differences ile eklenir.
+
+_TR_DIFFERENCES = ((0xD0, "/Gbreve"), (0xDD, "/Idotaccent"), (0xDE, "/Scedilla"),
+                   (0xF0, "/gbreve"), (0xFD, "/dotlessi"), (0xFE, "/scedilla"))
+# Genişlik hesabı için: Türkçe harfler Helvetica'da bu harflerle aynı genişliktedir
+_TR_WIDTH_SUBST = str.maketrans("ğĞşŞıİ", "gGsSII")
+
+def _font_resource(base_font: str) -> DictionaryObject:
+    encoding = DictionaryObject({
+        NameObject("/Type"): NameObject("/Encoding"),
+        NameObject("/BaseEncoding"): NameObject("/WinAnsiEncoding"),
+        NameObject("/Differences"): ArrayObject(
+            item for code, glyph in _TR_DIFFERENCES for item in (NumberObject(code), NameObject(glyph))
+        ),
+    })
+    return DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/" + base_font),
+        NameObject("/Encoding"): encoding,
+    })
+
+def _pdf_string(text: str) -> bytes:
+    data = text.encode("cp1254", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def _num(v: float) -> str:
+    return ("%.4f" % v).rstrip("0").rstrip(".")
+
+@lru_cache(maxsize=64)
+def _top_text_ops(top_lines: tuple) -> bytes:
+    """Üst metin bloğunun içerik akışı; aynı satırlar için bir kez üretilir."""
+    return _text_ops(top_lines, TOP_TEXT_FONT[1], MARGIN, PAGE_H - MARGIN)
+
+def _text_ops(lines: tuple, font_size: float, x: float, top: float) -> bytes:
+    line_height = font_size * 1.3
+    parts = [f"BT /F1 {_num(font_size)} Tf {_num(line_height)} TL "
+             f"1 0 0 1 {_num(x)} {_num(top - line_height)} Tm\n".encode("ascii")]
+    for i, line in enumerate(lines):
+        parts.append((b"T* " if i else b"") + _pdf_string(line) + b" Tj\n")
+    parts.append(b"ET\n")
+    return b"".join(parts)
+
+def _label_ops(label_text: str, label_x_center: float, label_y: float, font_size: float = LABEL_FONT[1]) -> bytes:
+    font_name = LABEL_FONT[0]
+    width = stringWidth(label_text.translate(_TR_WIDTH_SUBST), font_name, font_size)
+    return (f"BT /F2 {_num(font_size)} Tf 1 0 0 1 {_num(label_x_center - width / 2.0)} {_num(label_y)} Tm "
+            .encode("ascii") + _pdf_string(label_text) + b" Tj ET\n")
+
+def _build_base_page(top_lines: tuple, label_text: str, barcode_w_pt: float, barcode_h_pt: float,
+                     extra_ops: bytes = b""):
+    """
+    Üst metin + etiketli A4 sayfayı doğrudan PageObject olarak kurar (serileştirme yok).
+    `extra_ops` içerik akışının sonuna eklenir (ör. barcode Form XObject çağrısı).
+    """
+    # Barcode'u sayfa ortasına yerleştireceğiz
+    x = (PAGE_W - barcode_w_pt) / 2.0
+    y = (PAGE_H - barcode_h_pt) / 2.0
+
+    # Etiket konumu: barcode altından küçük bir boşlukla
+    label_x_center = PAGE_W / 2.0
+    label_y = y - GAP_BARCODE_LABEL
+
+    ops = _top_text_ops(top_lines) + _label_ops(label_text, label_x_center, label_y) + extra_ops
+    return _text_page(PAGE_W, PAGE_H, ops), (x, y)
+
+def _build_cell_page(layout: CellLayout, top_lines: tuple, label_text: str, extra_ops: bytes = b""):
+    """_build_base_page'in N-up hücre karşılığı: hücre boyutlu sayfa, hücre düzeniyle."""
+    ops = (_text_ops(top_lines, layout.text_size, layout.text_x, layout.text_top)
+           + _label_ops(label_text, layout.width / 2.0, layout.label_y, layout.label_size) + extra_ops)
+    return _text_page(layout.width, layout.height, ops)
+
+def _text_page(width: float, height: float, ops: bytes):
+    content = DecodedStreamObject()
+    content.set_data(ops)
+
+    page = PageObject.create_blank_page(width=width, height=height)
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/Font"): DictionaryObject({
+            NameObject("/F1"): _font_resource(TOP_TEXT_FONT[0]),
+            NameObject("/F2"): _font_resource(LABEL_FONT[0]),
+        }),
+        NameObject("/ProcSet"): ArrayObject([NameObject("/PDF"), NameObject("/Text")]),
+    })
+    page[NameObject("/Contents")] = content.flate_encode()
+    return page
+
+# -------------------- Barcode önbelleği --------------------
+
+class BarcodeTemplate(NamedTuple):
+    page: object          # PdfReader'ın ilk sayfası (yalnızca okunur, kopyalanmadan birleştirilir)
+    width: float          # mediabox genişliği (pt)
+    height: float         # mediabox yüksekliği (pt)
+    scale: float          # BARCODE_TARGET_W'ye göre ölçek
+
+class BarcodeCache:
+    """
+    Ayrıştırılmış barcode PDF'leri için sınırlı LRU önbellek. Anahtar mutlak yoldur; dosyanın
+    boyutu veya mtime'ı değişmişse kayıt geçersiz sayılır ve PDF yeniden ayrıştırılır.
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()   # anahtar -> (damga, BarcodeTemplate)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, pdf_path: Path) -> BarcodeTemplate:
+        key = os.path.abspath(pdf_path)
+        st = os.stat(key)
+        return self._lookup(key, (st.st_size, st.st_mtime_ns), key)
+
+    def get_bytes(self, data: bytes) -> BarcodeTemplate:
+        """Bellekteki barcode PDF'i; anahtar içeriğin özetidir, bu yüzden geçersizleşmez."""
+        key = ("bytes", hashlib.blake2b(data, digest_size=16).digest())
+        return self._lookup(key, len(data), BytesIO(data))
+
+    def _lookup(self, key, stamp, source) -> BarcodeTemplate:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == stamp:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+
+        template = _load_barcode_template(source)
+
+        with self._lock:
+            self._entries[key] = (stamp, template)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+def _load_barcode_template(source) -> BarcodeTemplate:
+    # source: dosya yolu (str) veya BytesIO
+    bc_page = PdfReader(source).pages[0]
+    bc_w = float(bc_page.mediabox.width)
+    bc_h = float(bc_page.mediabox.height)
+    # Ölçek: hedef genişliğe göre
+    return BarcodeTemplate(bc_page, bc_w, bc_h, BARCODE_TARGET_W / bc_w)
+
+barcode_cache = BarcodeCache()
+
+# -------------------- Dahili barcode --------------------
+
+@lru_cache(maxsize=256)
+def _native_symbol(symbology: str, value: str):
+    return encode_symbol(symbology, value)
+
+def _native_aspect(symbol) -> float:
+    # Sayfadaki düzenle aynı oran: 1D kodlarda yükseklik sabit LINEAR_BARCODE_H'dir
+    return LINEAR_BARCODE_H / BARCODE_TARGET_W if symbol.linear else symbol.height / symbol.width
+
+def _symbol_ops(symbol, sx: float, sy: float, x: float, y: float) -> bytes:
+    # Dikdörtgenler modül biriminde yazılır; ölçek ve konum tek bir `cm` ile verilir
+    parts = [f"q 0 g {_num(sx)} 0 0 {_num(sy)} {_num(x)} {_num(y)} cm\n".encode("ascii")]
+    parts.extend(b"%d %d %d %d re\n" % r for r in symbol.rects)
+    parts.append(b"f Q\n")
+    return b"".join(parts)
+
+@lru_cache(maxsize=256)
+def _native_barcode_ops(symbology: str, value: str) -> tuple:
+    """Dahili sembolün sayfa ortasına yerleşmiş (genişlik, yükseklik, içerik akışı) üçlüsü."""
+    symbol = _native_symbol(symbology, value)
+    sx = BARCODE_TARGET_W / symbol.width
+    sy = LINEAR_BARCODE_H / symbol.height if symbol.linear else sx
+    w, h = symbol.width * sx, symbol.height * sy
+    x, y = (PAGE_W - w) / 2.0, (PAGE_H - h) / 2.0
+    return w, h, _symbol_ops(symbol, sx, sy, x, y)
+
+def _compose_native_page(symbology: str, value: str, top_lines: tuple, label_text: str):
+    """Barcode'u PDF birleştirmeden, temel sayfanın içerik akışına vektör olarak çizer."""
+    w, h, ops = _native_barcode_ops(normalize_symbology(symbology), value)
+    page, _ = _build_base_page(top_lines, label_text, w, h, ops)
+    return page
+
+def _compose_native_cell(symbology: str, value: str, txt_path: Path, label_text: str, cell: tuple):
+    """_compose_native_page'in N-up hücre karşılığı; `cell` (genişlik, yükseklik) pt."""
+    symbol = _native_symbol(normalize_symbology(symbology), value)
+    layout = cell_layout(cell[0], cell[1], _native_aspect(symbol), TOP_TEXT_FONT[1], LABEL_FONT[1])
+    ops = _symbol_ops(symbol, layout.barcode_w / symbol.width, layout.barcode_h / symbol.height,
+                      layout.barcode_x, layout.barcode_y)
+    return _build_cell_page(layout, read_cell_text_lines(txt_path, layout), label_text, ops)
+
+# -------------------- Sayfa birleştirme --------------------
+
+def _compose_base(barcode: BarcodeTemplate, top_lines: tuple, label_text: str):
+    """
+    Üst metin + etiketli A4 temel sayfayı (barcode'suz) üretir; barcode'un sol alt köşesinin
+    sayfadaki konumunu (x, y) ile birlikte döner.
+    """
+    scale = barcode.scale
+    barcode_w_pt = barcode.width * scale
+    barcode_h_pt = barcode.height * scale
+
+    # A4 temel sayfa: üst metin + etiket (barcode henüz basılmadı)
+    return _build_base_page(top_lines, label_text, barcode_w_pt, barcode_h_pt)
+
+def _compose_page(barcode: BarcodeTemplate, top_lines: tuple, label_text: str):
+    """
+    Barcode sayfasını ölçekleyip üst metin + etiketli A4 temel sayfaya yerleştirir.
+    Dönen sayfa nesnesi bir PdfWriter'a eklenmeye hazırdır.
+    """
+    base_page, (x, y) = _compose_base(barcode, top_lines, label_text)
+
+    # Barcode'u (ölçeklenmiş) A4'e ortala + yerleştir
+    t = Transformation().scale(barcode.scale).translate(x, y)
+    base_page.merge_transformed_page(barcode.page, t)
+    return base_page
+
+def _compose_cell_base(barcode: BarcodeTemplate, txt_path: Path, label_text: str, cell: tuple):
+    """
+    N-up hücre sayfası (barcode'suz): düzen hücre boyutuna göre kurulur (bkz.
+    lsmaker.impose.cell_layout). Barcode'un hücredeki (x, y, ölçek) yerleşimini de döner.
+    """
+    layout = cell_layout(cell[0], cell[1], barcode.height / barcode.width, TOP_TEXT_FONT[1], LABEL_FONT[1])
+    page = _build_cell_page(layout, read_cell_text_lines(txt_path, layout), label_text)
+    return page, (layout.barcode_x, layout.barcode_y, layout.barcode_w / barcode.width)
+
+def _compose_cell_page(barcode: BarcodeTemplate, txt_path: Path, label_text: str, cell: tuple):
+    page, (x, y, scale) = _compose_cell_base(barcode, txt_path, label_text, cell)
+    page.merge_transformed_page(barcode.page, Transformation().scale(scale).translate(x, y))
+    return page
+
+# -------------------- Yazım --------------------
+#
+# Belirlenimci (deterministic) modda aynı girdiler bayt bayt aynı PDF'i üretir: /Info yalnızca
+# sabit bir /Producer içerir (SOURCE_DATE_EPOCH tanımlıysa tarihler ondan alınır) ve /ID,
+# zaman/rastgelelik yerine belgenin içeriğinden türetilir. Ayar ortam değişkeninde tutulur;
+# böylece spawn ile başlayan işçi süreçler de aynı modda çalışır.
+
+DETERMINISTIC_ENV = "LSMAKER_DETERMINISTIC"
+
+def set_deterministic(enabled: bool = True):
+    if enabled:
+        os.environ[DETERMINISTIC_ENV] = "1"
+    else:
+        os.environ.pop(DETERMINISTIC_ENV, None)
+
+def deterministic_output() -> bool:
+    return os.environ.get(DETERMINISTIC_ENV, "") not in ("", "0")
+
+def _fixed_metadata() -> dict:
+    from . import __version__
+
+    meta = {"/Producer": f"LsMaker {__version__}"}
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if epoch.isdigit():
+        stamp = time.strftime("D:%Y%m%d%H%M%SZ", time.gmtime(int(epoch)))
+        meta["/CreationDate"] = meta["/ModDate"] = stamp
+    return meta
+
+def write_pdf(writer: PdfWriter, stream):
+    """`writer`'ı `stream`'e yazar; belirlenimci moddaysa meta veriyi ve /ID'yi sabitler."""
+    if deterministic_output():
+        writer.metadata = _fixed_metadata()
+        writer._ID = None       # pypdf iç alanı; sürüm build-windows.yml'de sabitlenir
+        # /ID = belge yapısının özeti (iki kimlik aynı); içerik aynıysa kimlik de aynıdır
+        writer.generate_file_identifiers()
+    writer.write(stream)
+
+def _page_bytes(page) -> bytes:
+    writer = PdfWriter()
+    writer.add_page(page)
+    buf = BytesIO()
+    write_pdf(writer, buf)
+    return buf.getvalue()
+
+def output_path(label_text: str, target_dir: Path, out_name: str = None) -> Path:
+    # Çıktı dosya adı: verilmişse out_name (bkz. lsmaker.naming), değilse label_text (sanitize)
+    return Path(target_dir) / (out_name or sanitize_filename(label_text) + ".pdf")
+
+@contextmanager
+def atomic_output(path: Path):
+    """
+    `path` için yazma dosyası açar: veri aynı klasörde geçici bir dosyaya yazılır ve blok
+    hatasız biterse os.replace ile yerine taşınır. Okuyucular yarım yazılmış PDF görmez;
+    hata olursa hedef dosyaya dokunulmaz.
+
+    Geçici dosya taşınmadan önce fsync edilir: elektrik kesintisinden sonra hedef ad boş veya
+    sıfırlarla dolu bir dosyayı göstermez. Klasör girdisi fsync edilmez; kesintide kaybolan bir
+    yeniden adlandırma çıktının hiç yazılmamış görünmesine yol açar, bu da --resume ile yeniden
+    üretilir (bkz. lsmaker.journal).
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def _write_single_page(page, label_text: str, target_dir: Path, out_name: str = None) -> Path:
+    writer = PdfWriter()
+    writer.add_page(page)
+
+    out_path = output_path(label_text, target_dir, out_name)
+    with atomic_output(out_path) as f:
+        write_pdf(writer, f)
+    return out_path
+
+def compose_final_pdf(barcode_pdf_path: Path, txt_path: Path, label_text: str, out_dir: Path = None,
+                      stats: ComposeStats = None, out_name: str = None):
+    """
+    Tek etiket PDF'i oluşturup yolunu döner. `stats` verilirse (veya timing kancası / log
+    açıksa) aşama süreleri ve bayt sayıları ölçülür; bkz. lsmaker.timing. `out_name`
+    verilirse etiketten türetilen dosya adı yerine kullanılır.
+    """
+    if stats is None and timing_wanted():
+        stats = ComposeStats(label_text)
+    st = stats if stats is not None else NULL_STATS
+
+    # TXT oku (yalnızca sayfaya sığan kadarı)
+    with st.stage("read_txt"):
+        top_lines = read_top_text_lines(txt_path)
+
+    # Barcode PDF ilk sayfa (aynı şablon tekrar kullanılıyorsa önbellekten)
+    with st.stage("parse_barcode"):
+        barcode = barcode_cache.get(barcode_pdf_path)
+
+    with st.stage("draw_base"):
+        page, (x, y) = _compose_base(barcode, top_lines, label_text)
+
+    # Barcode'u (ölçeklenmiş) A4'e ortala + yerleştir
+    with st.stage("merge"):
+        page.merge_transformed_page(barcode.page, Transformation().scale(barcode.scale).translate(x, y))
+
+    target_dir = out_dir if out_dir else barcode_pdf_path.parent
+    with st.stage("write"):
+        out_path = _write_single_page(page, label_text, target_dir, out_name)
+
+    if stats is not None:
+        stats.label = label_text
+        stats.out_path = out_path
+        stats.bytes_in = os.path.getsize(barcode_pdf_path) + os.path.getsize(txt_path)
+        stats.bytes_out = os.path.getsize(out_path)
+        stats.emit()
+    return out_path
+
+def compose_native_pdf(symbology: str, value: str, txt_path: Path, label_text: str, out_dir: Path = None,
+                       stats: ComposeStats = None, out_name: str = None):
+    """
+    compose_final_pdf'in barcode PDF'siz karşılığı: `value` verilen türde (code128, ean13, qr)
+    üretilip sayfaya doğrudan çizilir. Çıktı klasörü verilmezse TXT'nin klasörü kullanılır.
+    """
+    if stats is None and timing_wanted():
+        stats = ComposeStats(label_text)
+    st = stats if stats is not None else NULL_STATS
+
+    with st.stage("read_txt"):
+        top_lines = read_top_text_lines(txt_path)
+
+    with st.stage("draw_base"):
+        page = _compose_native_page(symbology, value, top_lines, label_text)
+
+    target_dir = out_dir if out_dir else txt_path.parent
+    with st.stage("write"):
+        out_path = _write_single_page(page, label_text, target_dir, out_name)
+
+    if stats is not None:
+        stats.label = label_text
+        stats.out_path = out_path
+        stats.bytes_in = os.path.getsize(txt_path)
+        stats.bytes_out = os.path.getsize(out_path)
+        stats.emit()
+    return out_path
+
+# -------------------- Bellek içi API --------------------
+
+def _source_top_lines(txt) -> tuple:
+    # txt: yol (str / PathLike), bayt dizisi ya da metin veya ikili akış
+    if isinstance(txt, (str, os.PathLike)):
+        return read_top_text_lines(txt)
+    font_name, font_size = TOP_TEXT_FONT
+    available_width = PAGE_W - 2 * MARGIN
+    if isinstance(txt, (bytes, bytearray, memoryview)):
+        text = bytes(txt).decode("utf-8", errors="replace")
+        return wrap_top_text(text, font_name, font_size, available_width)
+    # Akış: yalnızca sayfaya sığan kadarı okunur (önbelleğe alınmaz)
+    if isinstance(txt.read(0), bytes):
+        txt = TextIOWrapper(txt, encoding="utf-8", errors="replace", newline=None)
+        try:
+            return _fit_lines(txt, font_name, font_size, available_width)
+        finally:
+            txt.detach()          # çağıranın akışı kapatılmaz
+    return _fit_lines(txt, font_name, font_size, available_width)
+
+def _source_barcode(barcode) -> BarcodeTemplate:
+    # barcode: yol, PDF baytları ya da ikili akış; akış içeriği özetle önbelleğe alınır
+    if isinstance(barcode, (str, os.PathLike)):
+        return barcode_cache.get(barcode)
+    if isinstance(barcode, (bytes, bytearray, memoryview)):
+        return barcode_cache.get_bytes(bytes(barcode))
+    return barcode_cache.get_bytes(barcode.read())
+
+def _source_size(source) -> int:
+    # Girdi bayt sayısı: yol için dosya boyutu, bayt dizisi için uzunluğu; akışlarda bilinmez (0)
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if isinstance(source, memoryview):
+        return source.nbytes
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    return 0
+
+def _compose_from_sources(barcode, txt, label_text: str, symbology: str, st):
+    with st.stage("read_txt"):
+        top_lines = _source_top_lines(txt)
+    if symbology is not None:
+        with st.stage("draw_base"):
+            return _compose_native_page(symbology, barcode, top_lines, label_text)
+    with st.stage("parse_barcode"):
+        template = _source_barcode(barcode)
+    with st.stage("draw_base"):
+        page, (x, y) = _compose_base(template, top_lines, label_text)
+    with st.stage("merge"):
+        page.merge_transformed_page(template.page, Transformation().scale(template.scale).translate(x, y))
+    return page
+
+def compose_to_stream(barcode, txt, label_text: str, stream, symbology: str = None,
+                      stats: ComposeStats = None) -> int:
+    """
+    Diske dokunmadan tek etiket PDF'i üretip `stream`'e yazar; yazılan bayt sayısını döner.
+
+    `barcode` barcode PDF'in yolu, baytları veya ikili akışıdır; `symbology` (code128, ean13,
+    qr) verilirse `barcode` dahili üretilecek değerdir. `txt` TXT yolu, baytları (UTF-8) veya
+    metin / ikili akıştır. Arayamayan (seekable olmayan) akışlara önce bellekte yazılır.
+    `stats.bytes_in` yollar için dosya boyutlarını, bayt girdiler için uzunluklarını sayar;
+    akış girdileri sayılmaz.
+    """
+    if stats is None and timing_wanted():
+        stats = ComposeStats(label_text)
+    st = stats if stats is not None else NULL_STATS
+
+    page = _compose_from_sources(barcode, txt, label_text, symbology, st)
+    writer = PdfWriter()
+    writer.add_page(page)
+    with st.stage("write"):
+        seekable = getattr(stream, "seekable", None)
+        if seekable is not None and seekable():
+            start = stream.tell()
+            write_pdf(writer, stream)
+            written = stream.tell() - start
+        else:
+            buf = BytesIO()
+            write_pdf(writer, buf)
+            stream.write(buf.getbuffer())
+            written = buf.tell()
+
+    if stats is not None:
+        stats.label = label_text
+        # Dahili barcode'da `barcode` bir değerdir, girdi dosyası değil (bkz. compose_native_pdf)
+        stats.bytes_in = _source_size(txt) + (0 if symbology is not None else _source_size(barcode))
+        stats.bytes_out = written
+        stats.emit()
+    return written
+
+def compose_pdf_bytes(barcode, txt, label_text: str, symbology: str = None,
+                      stats: ComposeStats = None) -> bytes:
+    """compose_to_stream ile aynı girdilerle üretilen PDF'i bayt dizisi olarak döner."""
+    buf = BytesIO()
+    compose_to_stream(barcode, txt, label_text, buf, symbology, stats)
+    return buf.getvalue()
@@ -0,0 +1,123 @@
+"""
+N-up yerleşim (imposition): bir A4 yaprağa satır x sütun ızgarasında birden çok etiket.
+A4 sayfa küçültülmez: her hücre, hücre boyutuna göre yeniden düzenlenir (bkz. cell_layout).
+Yalnızca geometri; hücre sayfaları lsmaker.compose'da, PDF yazımı lsmaker.batch.DocumentSink'tedir.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Yaprak boyutu: tek etiket sayfasıyla aynı A4 (bkz. lsmaker.compose.PAGE_W / PAGE_H)
+SHEET_W = 21 * 72.0 / 2.54
+SHEET_H = 29.7 * 72.0 / 2.54
+NUP_MARGIN = 18.0     # yaprak kenar boşluğu (pt)
+NUP_GUTTER = 9.0      # hücreler arası boşluk (pt)
+
+# Hücre düzeni kuralları
+CELL_PADDING = 6.0            # hücre iç kenar boşluğu (pt)
+CELL_MIN_FONT = 6.0           # hücrede en küçük punto
+CELL_BARCODE_FRACTION = 0.8   # barcode genişliği / hücre iç genişliği (üst sınır)
+CELL_MIN_TEXT_LINES = 2       # barcode gerekirse küçültülür; üst metne en az bu kadar satır kalır
+
+_GRID_RE = re.compile(r"^\s*(\d+)\s*[xX*]\s*(\d+)\s*$")
+
+class Imposition(NamedTuple):
+    rows: int
+    cols: int
+    gutter: float = NUP_GUTTER
+    margin: float = NUP_MARGIN
+
+    @property
+    def per_sheet(self) -> int:
+        return self.rows * self.cols
+
+    @property
+    def cell_size(self) -> tuple:
+        cell_w = (SHEET_W - 2 * self.margin - (self.cols - 1) * self.gutter) / self.cols
+        cell_h = (SHEET_H - 2 * self.margin - (self.rows - 1) * self.gutter) / self.rows
+        return cell_w, cell_h
+
+    def cell_transform(self, index: int, page_w: float, page_h: float) -> tuple:
+        """
+        `index`. hücre (sol üstten başlayıp satır satır) için (ölçek, x, y): page_w x page_h
+        boyutlu etiket sayfası oranı korunarak hücreye sığdırılır ve hücrede ortalanır.
+        """
+        row, col = divmod(index, self.cols)
+        cell_w, cell_h = self.cell_size
+        scale = min(cell_w / page_w, cell_h / page_h)
+        x = self.margin + col * (cell_w + self.gutter) + (cell_w - page_w * scale) / 2.0
+        top = SHEET_H - self.margin - row * (cell_h + self.gutter)
+        y = top - cell_h + (cell_h - page_h * scale) / 2.0
+        return scale, x, y
+
+class CellLayout(NamedTuple):
+    width: float          # hücre boyutu (pt); hücre sayfasının mediabox'ı
+    height: float
+    text_size: float      # üst metin puntosu
+    text_x: float         # üst metin sol kenarı
+    text_top: float       # üst metin bloğunun üst kenarı
+    text_width: float     # satır bölme genişliği
+    max_lines: int        # hücreye sığan üst metin satırı
+    label_size: float     # etiket puntosu
+    label_y: float        # etiket taban çizgisi
+    barcode_x: float      # barcode sol alt köşesi ve boyutu
+    barcode_y: float
+    barcode_w: float
+    barcode_h: float
+
+@lru_cache(maxsize=64)
+def cell_layout(cell_w: float, cell_h: float, aspect: float, text_size: float, label_size: float) -> CellLayout:
+    """
+    cell_w x cell_h hücre için etiket düzeni; `aspect` barcode'un yükseklik / genişlik oranı,
+    `text_size` ve `label_size` tek sayfalık düzendeki puntolardır.
+
+    Puntolar hücre genişliğiyle orantılı küçülür ama CELL_MIN_FONT'un altına inmez; alçak
+    hücrelerde orantılı puntolar sığmıyorsa CELL_MIN_FONT kullanılır. Etiket hücrenin altında,
+    barcode hemen üstünde ortalanır; barcode iç genişliğin CELL_BARCODE_FRACTION'ı kadardır ve
+    üst metne CELL_MIN_TEXT_LINES satır kalacak şekilde gerekirse küçültülür. Üst metin kalan
+    alanı yukarıdan doldurur. En küçük puntoyla da sığmıyorsa ValueError.
+    """
+    fit = min(1.0, cell_w / SHEET_W)
+    inner_w = cell_w - 2 * CELL_PADDING
+    top = cell_h - CELL_PADDING
+    sizes = ((max(CELL_MIN_FONT, text_size * fit), max(CELL_MIN_FONT, label_size * fit)),
+             (CELL_MIN_FONT, CELL_MIN_FONT))
+    for text_size, label_size in sizes:
+        line_h = text_size * 1.3
+        # Etiket taban çizgisi inen harflere yer bırakır; barcode altı etiketten bir satır yukarıda
+        label_y = CELL_PADDING + label_size * 0.25
+        bottom = label_y + label_size * 1.2
+        # Barcode ile üst metin arasında bir satırlık boşluk
+        room = top - bottom - (CELL_MIN_TEXT_LINES + 1) * line_h
+        if room > 0:
+            break
+    if inner_w <= 0 or room <= 0:
+        raise ValueError(f"Hücre ({cell_w:.0f} x {cell_h:.0f} pt) etiket düzeni için çok küçük.")
+
+    barcode_w = inner_w * CELL_BARCODE_FRACTION
+    barcode_h = barcode_w * aspect
+    if barcode_h > room:
+        barcode_w, barcode_h = room / aspect, room
+    max_lines = int((top - bottom - barcode_h) // line_h) - 1
+    return CellLayout(cell_w, cell_h, text_size, CELL_PADDING, top, inner_w, max_lines,
+                      label_size, label_y, (cell_w - barcode_w) / 2.0, bottom, barcode_w, barcode_h)
+
+def parse_imposition(spec: str, gutter: float = NUP_GUTTER, margin: float = NUP_MARGIN) -> Imposition:
+    """'4x2' biçimli (satır x sütun) ızgara tanımını çözer."""
+    m = _GRID_RE.match(spec or "")
+    if not m:
+        raise ValueError(f"Geçersiz ızgara: {spec!r} (örnek: 4x2 = 4 satır, 2 sütun)")
+    rows, cols = int(m.group(1)), int(m.group(2))
+    if rows < 1 or cols < 1:
+        raise ValueError(f"Geçersiz ızgara: {spec!r} (satır ve sütun en az 1 olmalı)")
+    grid = Imposition(rows, cols, max(0.0, gutter), max(0.0, margin))
+    cell_w, cell_h = grid.cell_size
+    if cell_w <= 0 or cell_h <= 0:
+        raise ValueError(f"{spec}: kenar boşluğu ve aralıklar yaprağa sığmıyor.")
+    try:
+        # cell_layout gerekirse CELL_MIN_FONT'a iner; barcode'suz bile sığmayan hücre hiçbir
+        # etikette sığmaz
+        cell_layout(cell_w, cell_h, 0.0, CELL_MIN_FONT, CELL_MIN_FONT)
+    except ValueError as e:
+        raise ValueError(f"{spec}: {e}") from None
+    return grid
@@ -0,0 +1,108 @@
+"""
+Toplu işler için kontrol noktası günlüğü (JSONL, yalnızca sonuna eklenir). Her manifest
+satırının durumu, çıktı yolu, boyutu ve özeti bir satır olarak yazılır. `--resume` ile yeniden
+başlatılan işte günlük bir kez sözlüğe okunur; tamamlanmış satırlar sözlükte tek aramayla
+bulunur, çıktının boyutu ve özeti doğrulanıp atlanır.
+
+Çıktılar fsync edilmiş geçici dosya + os.replace ile yazıldığından (bkz. compose.atomic_output)
+ve günlük kaydı çıktıdan sonra yazıldığından, elektrik kesintisinden sonra da günlükte "ok"
+görünen bir satırın dosyası ya eksiksizdir ya da hiç yoktur. Günlük her _FSYNC_EVERY kayıtta
+bir fsync edilir; kesintide son kayıtlar kaybolabilir, bu satırlar yalnızca yeniden üretilir.
+Özet doğrulaması, günlük dışından değiştirilmiş veya bozulmuş çıktıları da yakalar.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from .manifest import BatchResult, ManifestRow
+
+_FSYNC_EVERY = 64
+_READ_CHUNK = 1024 * 1024
+
+def row_identity(row: ManifestRow) -> str:
+    """Satırın girdilerini tanımlayan kısa özet; manifest değişmişse eski kayıt eşleşmez."""
+    source = (f"{row.symbology}:{row.barcode_value}" if row.barcode_value is not None
+              else str(row.barcode_pdf))
+    text = "\0".join((row.label, source, str(row.txt), str(row.out_dir or "")))
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=12).hexdigest()
+
+def file_checksum(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class BatchJournal:
+    """
+    `resume=True` ise mevcut günlük okunur ve sonuna eklenir; değilse günlük sıfırdan başlar.
+    `completed(row)` satır daha önce başarıyla bitmiş ve çıktısı yerinde ve değişmemişse
+    yolunu döner.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self._done = {}           # (satır no, kimlik) -> (çıktı yolu, boyut, özet)
+        if resume and self.path.exists():
+            self._load()
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+        self._pending = 0
+        self.resumed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    key = (entry["row"], entry["id"])
+                except (ValueError, KeyError, TypeError):
+                    # Çökme anında yarım kalmış son satır
+                    continue
+                if entry.get("status") == "ok":
+                    self._done[key] = (entry["out"], entry["size"], entry.get("blake2b"))
+                else:
+                    self._done.pop(key, None)
+
+    def completed(self, row: ManifestRow) -> Optional[Path]:
+        found = self._done.get((row.index, row_identity(row)))
+        if found is None:
+            return None
+        out, size, checksum = found
+        try:
+            # Ucuz boyut denetimi önce; özet yalnızca boyutu tutan dosyalar için okunur
+            if os.stat(out).st_size != size or (checksum and file_checksum(out) != checksum):
+                return None
+        except OSError:
+            return None
+        self.resumed += 1
+        return Path(out)
+
+    def record(self, result: BatchResult):
+        row = result.row
+        entry = {"row": row.index, "id": row_identity(row), "label": row.label}
+        if result.error:
+            entry.update(status="error", error=result.error)
+        else:
+            out = os.path.abspath(result.out_path)
+            entry.update(status="ok", out=out, size=os.path.getsize(out), blake2b=file_checksum(out))
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._pending += 1
+        if self._pending >= _FSYNC_EVERY:
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
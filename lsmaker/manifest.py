@@ -0,0 +1,108 @@
+"""
+Toplu işlem manifesti (CSV / JSONL) okuma. Yalnızca standart kütüphane kullanır; böylece
+komut satırı doğrulaması PDF kütüphaneleri yüklenmeden yapılabilir.
+"""
+import csv
+import json
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from .symbology import normalize_symbology
+
+MANIFEST_COLUMNS = ("barcode_pdf", "txt", "label", "out_dir", "symbology", "barcode_value")
+
+class ManifestRow(NamedTuple):
+    index: int                 # manifest içindeki sıra (0'dan başlar)
+    barcode_pdf: Optional[Path]
+    txt: Path
+    label: str
+    out_dir: Optional[Path] = None
+    symbology: Optional[str] = None       # barcode_value verilmişse: code128 / ean13 / qr
+    barcode_value: Optional[str] = None   # barcode PDF yerine dahili üretilecek değer
+    out_name: Optional[str] = None        # çıktı dosya adı (bkz. lsmaker.naming); yoksa etiketten
+
+class BatchResult(NamedTuple):
+    row: ManifestRow
+    out_path: Optional[Path]
+    error: Optional[str] = None
+    cached: bool = False       # çıktı önbellekten geldi (yeniden oluşturulmadı)
+
+def _manifest_row(index: int, record: dict, base_dir: Path, where: str) -> ManifestRow:
+    def text_of(key) -> str:
+        # JSONL'de sayısal değerler (ör. "label": 12345) metne çevrilir; liste / nesne kabul edilmez
+        value = record.get(key)
+        if value is None:
+            return ""
+        if isinstance(value, (list, dict)):
+            raise ValueError(f"{where}: {key} alanı metin veya sayı olmalı.")
+        return str(value).strip()
+
+    def path_of(key):
+        value = text_of(key)
+        if not value:
+            return None
+        p = Path(value)
+        # Göreli yollar manifest dosyasının klasörüne göre çözülür
+        return p if p.is_absolute() else base_dir / p
+
+    barcode_pdf, txt = path_of("barcode_pdf"), path_of("txt")
+    label = text_of("label")
+    value = text_of("barcode_value") or None
+    if (barcode_pdf is None and value is None) or txt is None or not label:
+        raise ValueError(f"{where}: barcode_pdf (veya barcode_value), txt ve label alanları zorunludur.")
+    symbology = None
+    if value is not None:
+        if barcode_pdf is not None:
+            raise ValueError(f"{where}: barcode_pdf ve barcode_value birlikte verilemez.")
+        try:
+            symbology = normalize_symbology(text_of("symbology"))
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}") from None
+    return ManifestRow(index, barcode_pdf, txt, label, path_of("out_dir"), symbology, value)
+
+def read_manifest(manifest_path: Path) -> List[ManifestRow]:
+    """
+    CSV (başlık satırlı; ',' ';' veya TAB ayraçlı) ya da JSONL manifest okur.
+    Sütunlar/anahtarlar: barcode_pdf, txt, label, out_dir (ops.). barcode_pdf yerine
+    barcode_value + symbology (code128 varsayılan, ean13, qr) verilirse barcode dahili üretilir.
+    """
+    manifest_path = Path(manifest_path)
+    base_dir = manifest_path.parent
+    rows = []
+
+    if manifest_path.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(manifest_path, encoding="utf-8-sig") as f:
+            for lineno, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                where = f"{manifest_path.name}:{lineno}"
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{where}: geçersiz JSON ({e.msg}).") from None
+                if not isinstance(record, dict):
+                    raise ValueError(f"{where}: her satır bir JSON nesnesi olmalı.")
+                rows.append(_manifest_row(len(rows), record, base_dir, where))
+        return rows
+
+    # Excel'den gelen CSV'ler BOM ve ';' ayraç içerebilir
+    with open(manifest_path, encoding="utf-8-sig", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(f, dialect=dialect)
+        fields = set(reader.fieldnames or ())
+        missing = {"txt", "label"} - fields
+        if not fields & {"barcode_pdf", "barcode_value"}:
+            missing.add("barcode_pdf")
+        if missing:
+            raise ValueError(f"{manifest_path.name}: eksik sütun(lar): {', '.join(sorted(missing))}")
+        for record in reader:
+            if not any((v or "").strip() for v in record.values() if isinstance(v, str)):
+                continue
+            where = f"{manifest_path.name}:{reader.line_num}"
+            rows.append(_manifest_row(len(rows), record, base_dir, where))
+    return rows
@@ -0,0 +1,160 @@
+"""
+Çıktı dosya adları: temizleme (sanitize), ad şablonları ve çakışmasız ad ayırma.
+
+Ad şablonları (--name-template) toplu iş başında bir kez derlenir, ör.
+
+    {label}_{row:06d}_{barcode_stem}      {date:%Y%m%d}/{label}      {label[:2]}/{label}
+
+Alanlar: label, row (1'den), index (0'dan), barcode_stem, txt_stem, symbology, date, time
+(iş başlangıcı; biçim verilmezse %Y%m%d / %H%M%S). `[a:b]` dilimi, biçimlenip temizlenmiş
+değere uygulanır. Şablondaki "/" alt klasör açar; böylece tek bir çıktı klasörü yüz binlerce
+girdiye büyümez. Alan değerlerindeki "/" ve diğer yasak karakterler tireye çevrilir.
+
+Aynı klasörde aynı ada düşen etiketler (ör. "A/1" ve "A-1") birbirinin üzerine yazmaz: bir
+toplu iş içinde verilen adlar klasör başına bellekteki bir kümede tutulur, diske exists() ile
+sorulmaz. Çakışma deterministik çözülür:
+
+    suffix  ikinci ve sonrakiler "ad (2).pdf", "ad (3).pdf" ... (manifest sırasına bağlı)
+    hash    ikinci ve sonrakiler "ad-1a2b3c4d.pdf"; ek satırın girdilerinden türetilir, bu
+            yüzden bir satırın eki sıradan bağımsızdır. Yalın "ad.pdf" yine manifestte ilk
+            gelen satıra düşer; hangi satırın eksiz kalacağı sıraya bağlıdır
+
+Önceki çalıştırmalardan kalan dosyalar çakışma sayılmaz; yeniden çalıştırma aynı adları
+üretip eski çıktıların üzerine (geçici dosya + os.replace ile) yazar.
+"""
+import hashlib
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+COLLISION_MODES = ("suffix", "hash")
+
+# Türkçe karakterler korunur; yasak karakterler tireye, boşluk dizileri tek boşluğa çevrilir
+_FORBIDDEN_RE = re.compile(r'[\\/:"*?<>|]+')
+_SPACES_RE = re.compile(r"\s+")
+_MAX_NAME = 120
+
+def _clean(text: str) -> str:
+    return _SPACES_RE.sub(" ", _FORBIDDEN_RE.sub("-", text)).strip()
+
+def sanitize_filename(name: str) -> str:
+    name = _clean(name)
+    # Çok uzun olmasın
+    return name[:_MAX_NAME] if name else "output"
+
+# -------------------- Ad şablonları --------------------
+
+_TOKEN_RE = re.compile(r"\{\{|\}\}|\{([a-z_]+)(?:\[(-?\d*):(-?\d*)\])?(?::([^{}]*))?\}|[{}]")
+_DEFAULT_SPECS = {"date": "%Y%m%d", "time": "%H%M%S"}
+
+def _barcode_stem(row, now):
+    return row.barcode_value if row.barcode_pdf is None else row.barcode_pdf.stem
+
+_FIELDS = {
+    "label": lambda row, now: row.label,
+    "row": lambda row, now: row.index + 1,
+    "index": lambda row, now: row.index,
+    "barcode_stem": _barcode_stem,
+    "txt_stem": lambda row, now: row.txt.stem,
+    "symbology": lambda row, now: row.symbology or "pdf",
+    "date": lambda row, now: now,
+    "time": lambda row, now: now,
+}
+TEMPLATE_FIELDS = tuple(_FIELDS)
+
+class _SampleRow:
+    # Şablon derlenirken biçimleri denemek için
+    index = 0
+    label = "label"
+    barcode_pdf = Path("barcode.pdf")
+    barcode_value = None
+    txt = Path("top.txt")
+    symbology = None
+
+_SAMPLE_ROW = _SampleRow()
+
+class NameTemplate:
+    """
+    Derlenmiş çıktı adı şablonu. `render(row)` uzantısız göreli yol döner ("ab/etiket_000001");
+    her bileşen sanitize_filename'den geçer, "." ve ".." bileşenlere izin verilmez.
+    """
+
+    def __init__(self, spec: str, now: datetime = None):
+        self.spec = spec
+        self.now = now or datetime.now()
+        self._parts = []          # düz metin (str) veya (alan okuyucu, biçim, dilim)
+        pos = 0
+        for m in _TOKEN_RE.finditer(spec):
+            if m.start() > pos:
+                self._parts.append(spec[pos:m.start()])
+            pos = m.end()
+            token = m.group(0)
+            if token in ("{{", "}}"):
+                self._parts.append(token[0])
+                continue
+            field = m.group(1)
+            if field is None:
+                raise ValueError(f"Ad şablonu: eşlenmemiş '{token}' ({spec!r})")
+            if field not in _FIELDS:
+                raise ValueError(f"Ad şablonu: bilinmeyen alan {field!r} (geçerli: {', '.join(TEMPLATE_FIELDS)})")
+            fmt = m.group(4) if m.group(4) is not None else _DEFAULT_SPECS.get(field, "")
+            cut = None
+            if m.group(2) is not None:
+                cut = slice(int(m.group(2)) if m.group(2) else None, int(m.group(3)) if m.group(3) else None)
+            try:
+                format(_FIELDS[field](_SAMPLE_ROW, self.now), fmt)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Ad şablonu: {{{field}:{fmt}}} biçimi geçersiz ({e}).") from None
+            self._parts.append((_FIELDS[field], fmt, cut))
+        if pos < len(spec):
+            self._parts.append(spec[pos:])
+        if not any(not isinstance(part, str) for part in self._parts):
+            raise ValueError("Ad şablonu en az bir alan içermeli (ör. {label}); yoksa tüm çıktılar aynı adı alır.")
+
+    def render(self, row) -> str:
+        out = []
+        for part in self._parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            getter, fmt, cut = part
+            text = _clean(format(getter(row, self.now), fmt))
+            out.append(text[cut] if cut else text)
+        name = "".join(out).replace("\\", "/")
+        if name.lower().endswith(".pdf"):
+            name = name[:-4]
+        parts = []
+        for component in name.split("/"):
+            component = sanitize_filename(component)
+            parts.append("-" if component in (".", "..") else component)
+        return "/".join(parts)
+
+
+class NameAllocator:
+    def __init__(self, mode: str = "suffix"):
+        if mode not in COLLISION_MODES:
+            raise ValueError(f"Bilinmeyen çakışma modu: {mode!r} (geçerli: {', '.join(COLLISION_MODES)})")
+        self.mode = mode
+        self._taken = {}        # klasör -> verilen adlar (normcase)
+        self._next = {}         # (klasör, kök) -> sıradaki sayı eki
+        self.collisions = 0
+
+    def allocate(self, target_dir: Path, stem: str, suffix: str = ".pdf", tag: str = "") -> str:
+        """`target_dir` içinde daha önce verilmemiş bir dosya adı döner ve onu ayırır."""
+        folder = os.path.normcase(os.path.abspath(target_dir))
+        taken = self._taken.setdefault(folder, set())
+        name = stem + suffix
+        if os.path.normcase(name) in taken:
+            self.collisions += 1
+            if self.mode == "hash":
+                digest = hashlib.blake2b(tag.encode("utf-8", "surrogatepass"), digest_size=4).hexdigest()
+                name = f"{stem}-{digest}{suffix}"
+            if os.path.normcase(name) in taken:
+                n = self._next.get((folder, stem), 2)
+                while os.path.normcase(f"{stem} ({n}){suffix}") in taken:
+                    n += 1
+                self._next[(folder, stem)] = n + 1
+                name = f"{stem} ({n}){suffix}"
+        taken.add(os.path.normcase(name))
+        return name
@@ -0,0 +1,147 @@
+"""
+İçerik adresli çıktı önbelleği (SQLite). Anahtar; barcode PDF baytlarının (veya dahili barcode
+türü + değerinin), TXT içeriğinin, etiket metninin, düzen sabitlerinin, belirlenimci modun
+ve kütüphane sürümünün özetidir. Anahtarı değişmeyen satır yeniden oluşturulmaz: önceki
+çıktı yerindeyse aynen bırakılır, başka yerdeyse hedefe sabit bağlanır (olmazsa kopyalanır).
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+from . import __version__
+from .compose import LAYOUT_FINGERPRINT, deterministic_output
+from .manifest import ManifestRow
+
+# Anahtar biçimi değişirse artırılır; eski kayıtlar kendiliğinden ıskalanır
+_KEY_FORMAT = 1
+_COMMIT_EVERY = 256
+_READ_CHUNK = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    key      TEXT PRIMARY KEY,
+    path     TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+)
+"""
+
+class OutputCache:
+    """
+    `key_for(row)` ile satır anahtarı hesaplanır, `restore(key, hedef)` önceki çıktıyı hedefe
+    getirmeye çalışır, `store(key, yol)` yeni çıktıyı kaydeder. Yazımlar toplu halde işlenir;
+    işi bitirince `close()` çağrılmalıdır (veya `with` bloğu kullanılmalıdır).
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._db = sqlite3.connect(str(self.db_path), timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+        self._digests = {}        # (mutlak yol, boyut, mtime_ns) -> içerik özeti
+        self._dirty = 0
+        self.hits = 0
+        self.links = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _file_digest(self, path: Path) -> bytes:
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        stamp = (key, st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=20)
+            with open(key, "rb") as f:
+                for block in iter(lambda: f.read(_READ_CHUNK), b""):
+                    h.update(block)
+            digest = self._digests[stamp] = h.digest()
+        return digest
+
+    def key_for(self, row: ManifestRow) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(repr((_KEY_FORMAT, __version__, LAYOUT_FINGERPRINT, deterministic_output())).encode("utf-8"))
+        if row.barcode_value is not None:
+            h.update(b"\0native\0" + f"{row.symbology}\0{row.barcode_value}".encode("utf-8"))
+        else:
+            h.update(b"\0pdf\0" + self._file_digest(row.barcode_pdf))
+        h.update(b"\0txt\0" + self._file_digest(row.txt))
+        h.update(b"\0label\0" + row.label.encode("utf-8"))
+        return h.hexdigest()
+
+    def restore(self, key: str, target: Path) -> Optional[Path]:
+        """Anahtarın çıktısı hâlâ sağlamsa `target`'a getirip döner; değilse None (ıska)."""
+        found = self._db.execute("SELECT path, size, mtime_ns FROM outputs WHERE key = ?", (key,)).fetchone()
+        if found is None:
+            self.misses += 1
+            return None
+        path, size, mtime_ns = found
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        if st is None or (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+            # Çıktı silinmiş veya üzerine yazılmış
+            self._db.execute("DELETE FROM outputs WHERE key = ?", (key,))
+            self._touch()
+            self.misses += 1
+            return None
+
+        target = Path(target)
+        if os.path.abspath(path) != os.path.abspath(target):
+            try:
+                self._link(Path(path), target)
+            except OSError:
+                self.misses += 1
+                return None
+            self.links += 1
+        self.hits += 1
+        return target
+
+    @staticmethod
+    def _link(source: Path, target: Path):
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            try:
+                os.link(source, tmp)
+            except OSError:
+                # Farklı disk veya sabit bağlantı desteklenmiyor; kopya taşınmadan önce diske
+                # yazılır (sabit bağlantı zaten diske yazılmış kaynağın verisini paylaşır)
+                shutil.copyfile(source, tmp)
+                with open(tmp, "rb+") as f:
+                    os.fsync(f.fileno())
+            os.replace(tmp, target)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def store(self, key: str, out_path: Path):
+        st = os.stat(out_path)
+        self._db.execute("INSERT OR REPLACE INTO outputs (key, path, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                         (key, os.path.abspath(out_path), st.st_size, st.st_mtime_ns))
+        self._touch()
+
+    def _touch(self):
+        self._dirty += 1
+        if self._dirty >= _COMMIT_EVERY:
+            self._db.commit()
+            self._dirty = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "links": self.links, "misses": self.misses}
@@ -0,0 +1,173 @@
+"""
+Akışlı (streaming) PDF yazıcı: her sayfanın nesneleri sayfa eklenir eklenmez dosyaya yazılır,
+bellekte yalnızca xref ofsetleri ve sayfa numaraları kalır. Sayfa ağacı, katalog ve trailer
+dosya kapatılırken yazılır. Çok büyük tek belge toplu işlerinde tepe bellek sayfa sayısından
+bağımsızdır. Dosya yazılırken geçici bir adda tutulur ve ancak kapanışta hedef ada taşınır.
+
+Sayfalar pypdf nesneleridir; başka bir belgeye (PdfReader) ait dolaylı nesneler ilk
+görüldüklerinde bu dosyaya kopyalanır ve aynı okuyucudan tekrar gelirlerse yeniden yazılmaz.
+"""
+import hashlib
+import os
+import weakref
+from array import array
+from io import BytesIO
+from pathlib import Path
+
+from pypdf.generic import (
+    ArrayObject, ByteStringObject, DecodedStreamObject, DictionaryObject, IndirectObject, NameObject,
+    NumberObject, StreamObject, TextStringObject,
+)
+
+_HEADER = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+# Sabit nesne numaraları; içerikleri kapanışta yazılır
+_CATALOG, _PAGES, _INFO = 1, 2, 3
+# Kopyalanmayan anahtarlar: üst sayfa ağacına geri bağlantılar kaynak belgenin tamamını çekerdi
+_SKIP_KEYS = frozenset(("/Parent", "/P"))
+_STREAM_KEYS = frozenset(("/Length", "/Filter", "/DecodeParms"))
+
+class StreamingPdfWriter:
+    """
+    `add_page(sayfa)` sayfayı ve ulaştığı yeni nesneleri hemen yazar; `add_object(nesne)`
+    paylaşılacak bir nesneyi (ör. Form XObject) bir kez yazıp dolaylı başvurusunu döner.
+    `close(metadata)` sayfa ağacını ve trailer'ı yazıp dosyayı kapatır.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self._file = open(self._tmp_path, "wb")
+        self._md5 = hashlib.md5()
+        self._pos = 0
+        self._offsets = array("Q", [0, 0, 0, 0])     # nesne no -> dosya ofseti (0: boş girdi)
+        self._kids = array("L")                     # sayfa nesne numaraları
+        # okuyucu -> {(kaynak no, nesil): bu dosyadaki no}; okuyucu bırakılınca kayıt da düşer
+        self._foreign = weakref.WeakKeyDictionary()
+        self._write(_HEADER)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._kids)
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._md5.update(data)
+        self._pos += len(data)
+
+    def _alloc(self) -> int:
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _ref(self, num: int) -> IndirectObject:
+        return IndirectObject(num, 0, self)
+
+    def _copy(self, obj, pending: list, top: bool = False):
+        # Başka belgelere ait başvuruları bu dosyanın numaralarına çevirerek kopyalar
+        if isinstance(obj, IndirectObject):
+            if obj.pdf is self:
+                return obj
+            numbers = self._foreign.setdefault(obj.pdf, {})
+            key = (obj.idnum, obj.generation)
+            num = numbers.get(key)
+            if num is None:
+                num = numbers[key] = self._alloc()
+                pending.append((num, obj.get_object()))
+            return self._ref(num)
+        if isinstance(obj, StreamObject):
+            if not top:
+                # Akışlar doğrudan nesne olamaz
+                num = self._alloc()
+                pending.append((num, obj))
+                return self._ref(num)
+            if "/Filter" in obj:
+                out = DecodedStreamObject()
+                out.set_data(obj._data)     # kodlanmış ham veri; pypdf iç alanı (sürüm sabit)
+            else:
+                raw = DecodedStreamObject()
+                raw.set_data(obj.get_data())
+                out = raw.flate_encode()
+            for key, value in obj.items():
+                if key not in _STREAM_KEYS or (key != "/Length" and "/Filter" in obj):
+                    out[key] = self._copy(value, pending)
+            return out
+        if isinstance(obj, DictionaryObject):
+            out = DictionaryObject()
+            for key, value in obj.items():
+                if key not in _SKIP_KEYS:
+                    out[key] = self._copy(value, pending)
+            return out
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._copy(item, pending) for item in obj)
+        return obj
+
+    def _write_object(self, num: int, obj):
+        buf = BytesIO()
+        buf.write(b"%d 0 obj\n" % num)
+        obj.write_to_stream(buf)
+        buf.write(b"\nendobj\n")
+        self._offsets[num] = self._pos
+        self._write(buf.getvalue())
+
+    def _write_graph(self, num: int, obj):
+        pending = [(num, obj)]
+        while pending:
+            n, o = pending.pop()
+            self._write_object(n, self._copy(o, pending, top=True))
+
+    def add_object(self, obj) -> IndirectObject:
+        num = self._alloc()
+        self._write_graph(num, obj)
+        return self._ref(num)
+
+    def add_page(self, page) -> int:
+        """Sayfayı yazar ve belgedeki sıra numarasını (0'dan) döner."""
+        page_dict = DictionaryObject({k: v for k, v in page.items() if k != "/Parent"})
+        page_dict[NameObject("/Parent")] = self._ref(_PAGES)
+        num = self._alloc()
+        self._write_graph(num, page_dict)
+        self._kids.append(num)
+        return len(self._kids) - 1
+
+    def close(self, metadata: dict = None):
+        if self._file is None:
+            return
+        self._write_object(_PAGES, DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Count"): NumberObject(len(self._kids)),
+            NameObject("/Kids"): ArrayObject(self._ref(n) for n in self._kids),
+        }))
+        self._write_object(_CATALOG, DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): self._ref(_PAGES),
+        }))
+        self._write_object(_INFO, DictionaryObject(
+            {NameObject(k): TextStringObject(v) for k, v in (metadata or {}).items()}
+        ))
+        # /ID: o ana kadar yazılan gövdenin özeti; aynı içerik aynı kimliği verir
+        file_id = ByteStringObject(self._md5.digest())
+
+        xref_pos = self._pos
+        lines = [b"xref\n0 %d\n" % len(self._offsets), b"0000000000 65535 f \n"]
+        lines.extend(b"%010d 00000 n \n" % off for off in self._offsets[1:])
+        trailer = DictionaryObject({
+            NameObject("/Size"): NumberObject(len(self._offsets)),
+            NameObject("/Root"): self._ref(_CATALOG),
+            NameObject("/Info"): self._ref(_INFO),
+            NameObject("/ID"): ArrayObject([file_id, file_id]),
+        })
+        buf = BytesIO()
+        trailer.write_to_stream(buf)
+        self._write(b"".join(lines) + b"trailer\n" + buf.getvalue() + b"\nstartxref\n%d\n%%%%EOF\n" % xref_pos)
+        # compose.atomic_output ile aynı: veri diske yazılmadan hedef ada taşınmaz
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Yarım kalan geçici dosyayı siler; hedef dosyaya dokunulmaz."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.unlink(self._tmp_path)
@@ -0,0 +1,154 @@
+"""
+Klasör tarama: bir dizin ağacındaki barcode PDF'lerini aynı köklü (veya bir düzenli ifadeyle
+eşleşen) TXT dosyalarıyla eşleyip manifest satırları üretir; etiket dosya adından alınır.
+
+Ağaç tek bir os.scandir yürüyüşüyle gezilir; eşleme bellekteki bir sözlükle yapılır, dosya
+başına ek stat veya exists() çağrısı yoktur. Yalnızca standart kütüphane kullanır.
+"""
+import os
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence
+
+from .manifest import ManifestRow
+
+class _ScanRows(Sequence):
+    """
+    Eşlenen çiftlerin tembel satır dizisi: ManifestRow (ve Path nesneleri) yalnızca satıra
+    erişildiğinde kurulur. Büyük ağaçlarda tarama süresi yol ayrıştırmaya değil dizin
+    yürüyüşüne bağlı kalır; satırlar toplu iş ilerledikçe tek tek üretilir.
+    """
+
+    def __init__(self, pairs: list):
+        self._pairs = pairs           # (klasör, pdf adı, klasör, txt adı, etiket)
+        self._folders = {}            # klasör -> Path; klasör yolu bir kez ayrıştırılır
+
+    def _path(self, folder: str, name: str) -> Path:
+        folder_path = self._folders.get(folder)
+        if folder_path is None:
+            folder_path = self._folders[folder] = Path(folder)
+        return folder_path.joinpath(name)
+
+    def _row(self, index: int) -> ManifestRow:
+        pdf_dir, pdf_name, txt_dir, txt_name, label = self._pairs[index]
+        return ManifestRow(index, self._path(pdf_dir, pdf_name), self._path(txt_dir, txt_name), label)
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self._pairs)))]
+        if index < 0:
+            index += len(self._pairs)
+        if not 0 <= index < len(self._pairs):
+            raise IndexError("satır dizini aralık dışında")
+        return self._row(index)
+
+    def __iter__(self):
+        return map(self._row, range(len(self._pairs)))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}: {len(self._pairs)} satır>"
+
+class ScanResult(NamedTuple):
+    rows: Sequence[ManifestRow]       # tembel dizi; bkz. _ScanRows
+    unpaired_pdfs: List[Path]
+    unpaired_txts: List[Path]
+    duplicates: List[Path]     # aynı anahtara ikinci kez düşen (kullanılmayan) dosyalar
+
+def _pair_key(stem: str, pattern: Optional["re.Pattern"]):
+    # (eşleme anahtarı, etiket) ya da eşleşmeyen dosya için None; anahtar veya etiket grubu
+    # eşleşmeye katılmamışsa (None) ya da boşsa da None döner
+    if pattern is None:
+        return stem, stem
+    m = pattern.search(stem)
+    if m is None:
+        return None
+    groups = pattern.groupindex
+    if "key" in groups:
+        key = m.group("key")
+    elif pattern.groups:
+        key = m.group(1)
+    else:
+        key = m.group(0)
+    label = m.group("label") if "label" in groups else key
+    if not key or not label or not label.strip():
+        return None
+    return key, label.strip()
+
+def scan_pairs(root: Path, pair_regex: str = None, recursive: bool = True, across_dirs: bool = False,
+               exclude: tuple = ()) -> ScanResult:
+    """
+    `root` altındaki *.pdf ve *.txt dosyalarını eşler (uzantılar büyük/küçük harf duyarsız).
+
+    Varsayılan anahtar dosya köküdür ("A123.pdf" + "A123.txt", etiket "A123"). `pair_regex`
+    verilirse kök üzerinde aranır: anahtar `key` adlı grup (yoksa ilk grup, o da yoksa tüm
+    eşleşme), etiket `label` adlı grup (yoksa anahtar) olur; eşleşmeyen dosyalar yok sayılır.
+    Desen eşleştiği hâlde anahtar veya etiket grubu boş kalan dosyalar eşsiz olarak raporlanır.
+    Eşleme varsayılan olarak aynı klasör içindedir; `across_dirs=True` ise ağacın tamamında
+    anahtar bazında yapılır. Nokta ile başlayan klasörler ve `exclude` içindekiler atlanır.
+    Satırlar klasör ve ad sırasıyla (deterministik) döner.
+    """
+    pattern = re.compile(pair_regex) if pair_regex else None
+    root = os.path.abspath(root)
+    skip = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+    pdfs, txts = {}, {}        # (klasör | None, anahtar) -> (klasör, dosya adı, etiket)
+    bad_pdfs, bad_txts = [], []    # desen eşleşti ama anahtar/etiket grubu boş: (klasör, ad)
+    duplicates = []            # (klasör, ad)
+
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if recursive and not name.startswith(".") and os.path.normcase(entry.path) not in skip:
+                    subdirs.append(entry.path)
+                continue
+            stem, dot, ext = name.rpartition(".")
+            if not stem.strip("."):
+                continue                   # uzantısız ya da ".pdf" gibi yalnız noktalı ad
+            ext = ext.lower()
+            if ext == "pdf":
+                index = pdfs
+            elif ext == "txt":
+                index = txts
+            else:
+                continue
+            found = (stem, stem) if pattern is None else _pair_key(stem, pattern)
+            if found is None:
+                if pattern is not None and pattern.search(stem) is not None:
+                    (bad_pdfs if index is pdfs else bad_txts).append((folder, name))
+                continue
+            key = (None if across_dirs else folder, found[0])
+            if key in index:
+                duplicates.append((folder, name))
+            else:
+                index[key] = (folder, name, found[1])
+        # Yığın LIFO: alfabetik sırayla gezmek için ters eklenir
+        stack.extend(reversed(subdirs))
+
+    # Satırların Path nesneleri erişildikçe kurulur (bkz. _ScanRows); eşsiz ve yinelenen
+    # dosyalar genelde az olduğundan hemen listelenir
+    pairs, unpaired_pdfs = [], []
+    for key, (pdf_dir, pdf_name, label) in pdfs.items():
+        txt = txts.pop(key, None)
+        if txt is None:
+            unpaired_pdfs.append((pdf_dir, pdf_name))
+        else:
+            pairs.append((pdf_dir, pdf_name, txt[0], txt[1], label))
+    rows = _ScanRows(pairs)
+    path_of = rows._path
+    return ScanResult(
+        rows,
+        [path_of(d, n) for d, n in bad_pdfs + unpaired_pdfs],
+        [path_of(d, n) for d, n in bad_txts] + [path_of(d, n) for d, n, _ in txts.values()],
+        [path_of(d, n) for d, n in duplicates],
+    )
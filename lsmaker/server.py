@@ -0,0 +1,251 @@
+"""
+Yerel HTTP oluşturma servisi. Uzun ömürlü tek süreç: yorumlayıcı açılışı, içe aktarmalar ve
+barcode ayrıştırma her etikette tekrar ödenmez.
+
+    POST /compose   JSON gövde -> application/pdf
+        label          (zorunlu) etiket metni
+        top_text | txt_path                      üst metin veya TXT dosya yolu
+        barcode_pdf | barcode_pdf_base64         barcode PDF yolu veya base64 içeriği
+        barcode_value [+ symbology]              veya dahili üretilecek barcode (code128, ean13, qr)
+    GET  /health    {"status": "ok"}
+
+PDF işleri bir ProcessPoolExecutor'a gönderilir; olay döngüsü bu sırada yeni istekleri kabul
+etmeye devam eder. Her işçi süreç kendi barcode ve metin önbelleğini istekler arasında korur.
+"""
+import asyncio
+import base64
+import binascii
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_HEADER_LINES = 100
+STREAM_CHUNK = 64 * 1024
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 422: "Unprocessable Entity",
+    500: "Internal Server Error",
+}
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+# -------------------- İşçi süreç tarafı --------------------
+
+def _init_worker(cache_size: int):
+    from .compose import barcode_cache
+
+    barcode_cache.maxsize = cache_size
+
+def _compose_job(job: dict) -> bytes:
+    # İşçi süreçte çalışır; önbellekler süreç ömrü boyunca sıcak kalır
+    from .compose import (
+        MARGIN, PAGE_W, TOP_TEXT_FONT, _compose_native_page, _compose_page, _page_bytes, barcode_cache,
+        read_top_text_lines, wrap_top_text,
+    )
+
+    if "barcode_value" in job:
+        barcode = None
+    elif "barcode_bytes" in job:
+        barcode = barcode_cache.get_bytes(job["barcode_bytes"])
+    else:
+        barcode = barcode_cache.get(job["barcode_pdf"])
+
+    if "txt_path" in job:
+        top_lines = read_top_text_lines(job["txt_path"])
+    else:
+        font_name, font_size = TOP_TEXT_FONT
+        top_lines = wrap_top_text(job["top_text"], font_name, font_size, PAGE_W - 2 * MARGIN)
+
+    if barcode is None:
+        return _page_bytes(_compose_native_page(job["symbology"], job["barcode_value"], top_lines, job["label"]))
+    return _page_bytes(_compose_page(barcode, top_lines, job["label"]))
+
+def _parse_job(payload) -> dict:
+    if not isinstance(payload, dict):
+        raise RequestError(400, "Gövde bir JSON nesnesi olmalı.")
+    label = payload.get("label")
+    if not isinstance(label, str) or not label.strip():
+        raise RequestError(422, "'label' zorunludur.")
+    job = {"label": label.strip()}
+
+    if isinstance(payload.get("txt_path"), str):
+        job["txt_path"] = Path(payload["txt_path"])
+    elif isinstance(payload.get("top_text"), str):
+        job["top_text"] = payload["top_text"]
+    else:
+        raise RequestError(422, "'top_text' veya 'txt_path' gerekli.")
+
+    if isinstance(payload.get("barcode_value"), str) and payload["barcode_value"].strip():
+        from .symbology import normalize_symbology
+
+        try:
+            job["symbology"] = normalize_symbology(payload.get("symbology") or "")
+        except ValueError as e:
+            raise RequestError(422, str(e)) from None
+        job["barcode_value"] = payload["barcode_value"].strip()
+    elif isinstance(payload.get("barcode_pdf_base64"), str):
+        try:
+            job["barcode_bytes"] = base64.b64decode(payload["barcode_pdf_base64"], validate=True)
+        except (binascii.Error, ValueError):
+            raise RequestError(422, "'barcode_pdf_base64' geçerli base64 değil.") from None
+    elif isinstance(payload.get("barcode_pdf"), str):
+        job["barcode_pdf"] = Path(payload["barcode_pdf"])
+    else:
+        raise RequestError(422, "'barcode_pdf', 'barcode_pdf_base64' veya 'barcode_value' gerekli.")
+    return job
+
+# -------------------- HTTP --------------------
+
+async def _read_request(reader: asyncio.StreamReader):
+    """Bir HTTP/1.1 isteği okur; bağlantı kapandıysa None döner."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError(400, "Geçersiz istek satırı.") from None
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise RequestError(400, "Çok fazla başlık.")
+
+    body = b""
+    if method == "POST":
+        if "content-length" not in headers:
+            raise RequestError(411, "Content-Length gerekli.")
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            raise RequestError(400, "Geçersiz Content-Length.") from None
+        if length < 0 or length > MAX_BODY_BYTES:
+            raise RequestError(413, "Gövde çok büyük.")
+        body = await reader.readexactly(length)
+
+    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+    return method, target.split("?", 1)[0], body, keep_alive
+
+async def _send(writer: asyncio.StreamWriter, status: int, body: bytes, content_type: str,
+                keep_alive: bool, extra_headers: dict = None):
+    head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    head.extend(f"{k}: {v}" for k, v in (extra_headers or {}).items())
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+    # Büyük PDF'ler parça parça yazılır; yavaş istemci belleği şişirmez
+    view = memoryview(body)
+    for start in range(0, len(view), STREAM_CHUNK):
+        writer.write(view[start:start + STREAM_CHUNK])
+        await writer.drain()
+    await writer.drain()
+
+async def _send_json(writer, status: int, obj, keep_alive: bool):
+    await _send(writer, status, json.dumps(obj, ensure_ascii=False).encode("utf-8"),
+                "application/json; charset=utf-8", keep_alive)
+
+class ComposeServer:
+    def __init__(self, pool: ProcessPoolExecutor):
+        self.pool = pool
+        self.served = 0
+        self.failed = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except RequestError as e:
+                    await _send_json(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                await self._dispatch(writer, method, path, body, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, writer, method: str, path: str, body: bytes, keep_alive: bool):
+        if path == "/health":
+            if method != "GET":
+                return await _send_json(writer, 405, {"error": "GET bekleniyor."}, keep_alive)
+            return await _send_json(writer, 200, {"status": "ok", "served": self.served,
+                                                  "failed": self.failed}, keep_alive)
+        if path != "/compose":
+            return await _send_json(writer, 404, {"error": "Bilinmeyen yol."}, keep_alive)
+        if method != "POST":
+            return await _send_json(writer, 405, {"error": "POST bekleniyor."}, keep_alive)
+
+        try:
+            try:
+                payload = json.loads(body)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                raise RequestError(400, "Gövde geçerli JSON değil.") from None
+            job = _parse_job(payload)
+        except RequestError as e:
+            self.failed += 1
+            return await _send_json(writer, e.status, {"error": str(e)}, keep_alive)
+
+        # İşçide zaten yüklüdür; ana süreçte ilk istekte içe aktarılır
+        from pypdf.errors import PdfReadError, PdfStreamError
+
+        loop = asyncio.get_running_loop()
+        try:
+            pdf = await loop.run_in_executor(self.pool, _compose_job, job)
+        except (OSError, ValueError, PdfReadError, PdfStreamError) as e:
+            # Okunamayan girdi yolu (eksik, klasör, izinsiz), PDF olmayan barcode içeriği veya
+            # kodlanamayan barcode değeri: istemci hatası. İş bellekte üretilir; diske yazmaz.
+            self.failed += 1
+            return await _send_json(writer, 422, {"error": str(e)}, keep_alive)
+        except Exception as e:
+            self.failed += 1
+            return await _send_json(writer, 500, {"error": str(e)}, keep_alive)
+
+        self.served += 1
+        from .compose import sanitize_filename
+
+        filename = quote(sanitize_filename(job["label"]) + ".pdf")
+        await _send(writer, 200, pdf, "application/pdf", keep_alive,
+                    {"Content-Disposition": f"attachment; filename*=UTF-8''{filename}"})
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = None,
+                cache_size: int = 32):
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_size,)) as pool:
+        app = ComposeServer(pool)
+        server = await asyncio.start_server(app.handle, host, port)
+        addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+        print(f"LsMaker servisi dinliyor: {addrs} ({workers} işçi)", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+def run_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = None,
+               cache_size: int = 32) -> int:
+    try:
+        asyncio.run(serve(host, port, workers, cache_size))
+    except KeyboardInterrupt:
+        print("Servis durduruldu.", file=sys.stderr)
+    return 0
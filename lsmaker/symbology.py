@@ -0,0 +1,135 @@
+"""
+Dahili barcode üretimi (Code128, EAN-13, QR). Semboller modül birimli dikdörtgenler olarak
+döner; yan yana (ve QR'da alt alta aynı aralıktaki) koyu modüller tek dikdörtgende birleşir,
+böylece içerik akışında sembol başına en az sayıda `re` işleci kalır.
+
+reportlab yalnızca Code128/QR kodlayıcıları ilk kez kullanıldığında yüklenir; manifest
+doğrulaması bu modülü PDF kütüphaneleri olmadan içe aktarabilir.
+"""
+from functools import lru_cache
+from typing import NamedTuple, Sequence
+
+SYMBOLOGIES = ("code128", "ean13", "qr")
+DEFAULT_SYMBOLOGY = "code128"
+
+# Sessiz bölgeler (modül): sembolün iki yanında boş kalması gereken alan
+_CODE128_QUIET = 10
+_EAN13_QUIET = (11, 7)
+_QR_QUIET = 4
+
+class BarcodeSymbol(NamedTuple):
+    width: int        # sessiz bölgeler dahil genişlik (modül)
+    height: int       # yükseklik (modül); 1D kodlarda 1
+    rects: tuple      # (x, y, w, h) modül birimli, sol alt köşe orijinli
+    linear: bool      # True ise 1D: yükseklik çizim sırasında ayrıca verilir
+
+def normalize_symbology(name: str) -> str:
+    key = (name or DEFAULT_SYMBOLOGY).strip().lower().replace("-", "").replace("_", "")
+    if key not in SYMBOLOGIES:
+        raise ValueError(f"Bilinmeyen barcode türü: {name!r} (geçerli: {', '.join(SYMBOLOGIES)})")
+    return key
+
+def _merge_rows(rows: Sequence[Sequence[bool]], x0: int, y0: int, height: int) -> tuple:
+    """
+    Koyu modül matrisini dikdörtgenlere çevirir: her satırdaki ardışık koyu modüller tek
+    parçadır, bir sonraki satırda aynı başlangıç/uzunlukta devam eden parça aşağı uzatılır.
+    Satır 0 en üsttedir; dönen y değerleri PDF'teki gibi aşağıdan yukarıdır.
+    """
+    rects = []
+    open_runs = {}            # (başlangıç, uzunluk) -> başladığı satır
+    for r, row in enumerate(rows):
+        runs = set()
+        c, n = 0, len(row)
+        while c < n:
+            if row[c]:
+                start = c
+                while c < n and row[c]:
+                    c += 1
+                runs.add((start, c - start))
+            else:
+                c += 1
+        for run in [run for run in open_runs if run not in runs]:
+            top = open_runs.pop(run)
+            rects.append((x0 + run[0], y0 + height - r, run[1], r - top))
+        for run in runs:
+            open_runs.setdefault(run, r)
+    r = len(rows)
+    for run, top in open_runs.items():
+        rects.append((x0 + run[0], y0 + height - r, run[1], r - top))
+    rects.sort(key=lambda t: (-t[1], t[0]))
+    return tuple(rects)
+
+def _linear_symbol(modules: Sequence[bool], quiet: tuple) -> BarcodeSymbol:
+    left, right = quiet
+    return BarcodeSymbol(left + len(modules) + right, 1, _merge_rows([modules], left, 0, 1), True)
+
+# -------------------- Code128 --------------------
+
+def _code128(value: str) -> BarcodeSymbol:
+    from reportlab.graphics.barcode.code128 import Code128
+
+    bad = sorted({ch for ch in value if ord(ch) > 127})
+    if bad:
+        raise ValueError(f"Code128 yalnızca ASCII karakter kodlayabilir: {''.join(bad)!r}")
+    code = Code128(value)
+    code.validate()
+    code.encode()
+    # decompose(): büyük harf çubuk, küçük harf boşluk; A..D = 1..4 modül
+    modules = []
+    for ch in code.decompose():
+        modules.extend([ch.isupper()] * (ord(ch.upper()) - ord("A") + 1))
+    return _linear_symbol(modules, (_CODE128_QUIET, _CODE128_QUIET))
+
+# -------------------- EAN-13 --------------------
+
+_EAN_L = ("0001101", "0011001", "0010011", "0111101", "0100011",
+          "0110001", "0101111", "0111011", "0110111", "0001011")
+_EAN_R = tuple(code.translate(str.maketrans("01", "10")) for code in _EAN_L)
+_EAN_G = tuple(code[::-1] for code in _EAN_R)
+# İlk rakam, sol yarıdaki L/G parite düzenini belirler
+_EAN_PARITY = ("LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG",
+               "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL")
+
+def ean13_checksum(digits: str) -> int:
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits[:12]))
+    return (10 - total % 10) % 10
+
+def _ean13(value: str) -> BarcodeSymbol:
+    digits = value.strip()
+    if not digits.isdigit() or not digits.isascii() or len(digits) not in (12, 13):
+        raise ValueError(f"EAN-13 değeri 12 veya 13 rakam olmalı: {value!r}")
+    check = ean13_checksum(digits)
+    if len(digits) == 12:
+        digits += str(check)
+    elif int(digits[12]) != check:
+        raise ValueError(f"EAN-13 kontrol hanesi hatalı: {value!r} (beklenen {check})")
+
+    parity = _EAN_PARITY[int(digits[0])]
+    bits = ["101"]
+    for p, d in zip(parity, digits[1:7]):
+        bits.append((_EAN_L if p == "L" else _EAN_G)[int(d)])
+    bits.append("01010")
+    bits.extend(_EAN_R[int(d)] for d in digits[7:])
+    bits.append("101")
+    return _linear_symbol([b == "1" for b in "".join(bits)], _EAN13_QUIET)
+
+# -------------------- QR --------------------
+
+def _qr(value: str) -> BarcodeSymbol:
+    from reportlab.graphics.barcode import qrencoder
+
+    qr = qrencoder.QRCode(None, qrencoder.QRErrorCorrectLevel.M)   # None: sürüm veriye göre seçilir
+    qr.addData(value)
+    qr.make()
+    n = qr.getModuleCount()
+    size = n + 2 * _QR_QUIET
+    return BarcodeSymbol(size, size, _merge_rows(qr.modules, _QR_QUIET, _QR_QUIET, n), False)
+
+_ENCODERS = {"code128": _code128, "ean13": _ean13, "qr": _qr}
+
+@lru_cache(maxsize=256)
+def encode_symbol(symbology: str, value: str) -> BarcodeSymbol:
+    """`value`'yu verilen türde kodlar; aynı (tür, değer) için sonuç önbellekten döner."""
+    if not value:
+        raise ValueError("Barcode değeri boş olamaz.")
+    return _ENCODERS[normalize_symbology(symbology)](value)
@@ -0,0 +1,114 @@
+"""
+compose_final_pdf için aşama bazlı süre ölçümü.
+
+Ölçüm yalnızca istendiğinde yapılır: çağıran bir ComposeStats verdiğinde, add_stats_hook ile
+bir geri çağırım kaydedildiğinde ya da "lsmaker.timing" logger'ı INFO seviyesinde açık
+olduğunda. Aksi halde her aşama paylaşılan boş bir bağlam yöneticisinden geçer.
+"""
+import json
+import logging
+import sys
+import time
+
+timing_log = logging.getLogger("lsmaker.timing")
+_hooks = []
+
+def add_stats_hook(fn):
+    """fn(ComposeStats) her ölçülen işten sonra çağrılır."""
+    _hooks.append(fn)
+
+def remove_stats_hook(fn):
+    _hooks.remove(fn)
+
+def enable_timing_log(stream=None):
+    """Ölçümleri satır başına bir JSON nesnesi olarak `stream`'e (varsayılan stderr) yazar."""
+    # fork ile başlayan işçiler üst sürecin handler'ını zaten miras alır
+    if any(getattr(h, "_lsmaker_timing", False) for h in timing_log.handlers):
+        return
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler._lsmaker_timing = True
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    timing_log.addHandler(handler)
+    timing_log.setLevel(logging.INFO)
+    timing_log.propagate = False
+
+def timing_wanted() -> bool:
+    return bool(_hooks) or timing_log.isEnabledFor(logging.INFO)
+
+class _Stage:
+    __slots__ = ("stats", "name", "wall", "cpu")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        prev = self.stats.stages.get(self.name)
+        if prev is not None:
+            wall, cpu = wall + prev[0], cpu + prev[1]
+        self.stats.stages[self.name] = (wall, cpu)
+        return False
+
+class ComposeStats:
+    """Tek bir etiketin aşama süreleri (duvar saati ve iş parçacığı CPU'su, sn) ve bayt sayıları."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.stages = {}          # aşama -> (duvar, cpu)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.out_path = None
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    @property
+    def wall(self) -> float:
+        return sum(w for w, _ in self.stages.values())
+
+    @property
+    def cpu(self) -> float:
+        return sum(c for _, c in self.stages.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "label": self.label,
+            "out_path": str(self.out_path) if self.out_path else None,
+            "wall_s": round(self.wall, 6),
+            "cpu_s": round(self.cpu, 6),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "stages": {name: {"wall_s": round(w, 6), "cpu_s": round(c, 6)}
+                       for name, (w, c) in self.stages.items()},
+        }
+
+    def emit(self):
+        for fn in _hooks:
+            fn(self)
+        if timing_log.isEnabledFor(logging.INFO):
+            timing_log.info(json.dumps(self.as_dict(), ensure_ascii=False))
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class _NullStats:
+    __slots__ = ()
+    _stage = _NullStage()
+
+    def stage(self, name: str):
+        return self._stage
+
+NULL_STATS = _NullStats()
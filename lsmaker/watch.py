@@ -0,0 +1,258 @@
+"""
+Klasör izleme servisi: gelen kutusuna düşen barcode PDF ve TXT dosyalarını gövde adına
+(stem) göre eşler, yazma bitince (dosya `settle` saniye değişmeden kalınca) etiketi bir
+süreç havuzunda oluşturur. Çıktılar çıkış klasörüne, işlenen girdiler `_processed` (hatalıysa
+`_failed`) klasörüne taşınır. Etiket metni dosyanın gövde adıdır.
+
+Linux'ta inotify kullanılır; her olay yalnızca ilgili dosyayı etkiler, klasör yeniden
+taranmaz. inotify yoksa (Windows, ağ paylaşımları) `poll_interval` aralıklarla tek bir
+os.scandir taramasıyla yalnızca değişen girişler bulunur.
+"""
+import ctypes
+import ctypes.util
+import heapq
+import os
+import select
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+
+_KINDS = {".pdf": "pdf", ".txt": "txt"}
+
+# -------------------- Olay kaynakları --------------------
+
+class _InotifySource:
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    _EVENT = struct.Struct("iIII")      # wd, mask, cookie, len
+
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify desteklenmiyor")
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 başarısız")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), self.IN_CLOSE_WRITE | self.IN_MOVED_TO)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch başarısız: {directory}")
+
+    def wait(self, timeout: float):
+        """Değişen dosya adlarını döner; kuyruk taştıysa None (tam tarama gerekir)."""
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return []
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 256 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, mask, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                if mask & self.IN_Q_OVERFLOW:
+                    return None
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name:
+                    names.append(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+class _PollingSource:
+    def __init__(self, directory: Path, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._index = {}        # ad -> (boyut, mtime_ns)
+        self._next_scan = 0.0
+
+    def wait(self, timeout: float):
+        now = time.monotonic()
+        if now < self._next_scan:
+            time.sleep(max(0.0, min(timeout, self._next_scan - now)))
+            if time.monotonic() < self._next_scan:
+                return []
+        self._next_scan = time.monotonic() + self.interval
+
+        changed = []
+        seen = {}
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+                stamp = (st.st_size, st.st_mtime_ns)
+                seen[entry.name] = stamp
+                if self._index.get(entry.name) != stamp:
+                    changed.append(entry.name)
+        self._index = seen
+        return changed
+
+    def close(self):
+        pass
+
+# -------------------- İşçi süreç --------------------
+
+def _compose_pair(pdf_path: Path, txt_path: Path, label: str, outbox: Path) -> Path:
+    from .compose import compose_final_pdf
+
+    return compose_final_pdf(pdf_path, txt_path, label, outbox)
+
+# -------------------- Servis --------------------
+
+class WatchFolder:
+    def __init__(self, inbox: Path, outbox: Path = None, processed: Path = None, failed: Path = None,
+                 settle: float = 1.0, workers: int = None, poll_interval: float = 1.0,
+                 use_inotify: bool = True, log=None):
+        self.inbox = Path(inbox)
+        self.outbox = Path(outbox) if outbox else self.inbox / "_out"
+        self.processed = Path(processed) if processed else self.inbox / "_processed"
+        self.failed_dir = Path(failed) if failed else self.inbox / "_failed"
+        self.settle = settle
+        self.workers = workers or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.log = log or (lambda msg: print(msg, file=sys.stderr))
+
+        self._files = {}          # ad -> ((boyut, mtime_ns), hazır_olma_zamanı)
+        self._heap = []           # (hazır_olma_zamanı, ad); eskimiş kayıtlar tembel atlanır
+        self._pairs = {}          # gövde adı -> {"pdf": ad, "txt": ad}
+        self._ready = deque()     # eşleşmesi tamamlanmış, gönderilmeyi bekleyen gövde adları
+        self._inflight = {}       # future -> (gövde adı, eş)
+        self._claimed = set()     # eşe alınmış (bekleyen veya işlenen) dosya adları
+        self.done = 0
+        self.errors = 0
+
+    def _open_source(self):
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                return _InotifySource(self.inbox)
+            except OSError as e:
+                self.log(f"inotify kullanılamıyor ({e}); yoklama moduna geçiliyor.")
+        return _PollingSource(self.inbox, self.poll_interval)
+
+    def _rescan(self, now: float):
+        with os.scandir(self.inbox) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    self._touch(entry.name, now)
+
+    def _touch(self, name: str, now: float):
+        if name in self._claimed or _KINDS.get(os.path.splitext(name)[1].lower()) is None:
+            return
+        try:
+            st = os.stat(self.inbox / name)
+        except FileNotFoundError:
+            self._files.pop(name, None)
+            return
+        ready_at = now + self.settle
+        self._files[name] = ((st.st_size, st.st_mtime_ns), ready_at)
+        heapq.heappush(self._heap, (ready_at, name))
+
+    def _promote(self, now: float):
+        # Yazması bitmiş (settle süresince değişmemiş) dosyaları eşlere ekler
+        while self._heap and self._heap[0][0] <= now:
+            ready_at, name = heapq.heappop(self._heap)
+            entry = self._files.get(name)
+            if entry is None or entry[1] != ready_at:
+                continue
+            try:
+                st = os.stat(self.inbox / name)
+            except FileNotFoundError:
+                del self._files[name]
+                continue
+            stamp = (st.st_size, st.st_mtime_ns)
+            if stamp != entry[0]:
+                self._files[name] = (stamp, now + self.settle)
+                heapq.heappush(self._heap, (now + self.settle, name))
+                continue
+            del self._files[name]
+            self._claimed.add(name)
+
+            stem, ext = os.path.splitext(name)
+            pair = self._pairs.setdefault(stem, {})
+            complete_before = len(pair) == 2
+            pair[_KINDS[ext.lower()]] = name
+            if len(pair) == 2 and not complete_before:
+                self._ready.append(stem)
+
+    def _submit(self, pool):
+        while self._ready and len(self._inflight) < self.workers * 4:
+            stem = self._ready.popleft()
+            pair = self._pairs.pop(stem, None)
+            if pair is None or len(pair) != 2:
+                continue
+            future = pool.submit(_compose_pair, self.inbox / pair["pdf"], self.inbox / pair["txt"],
+                                 stem, self.outbox)
+            self._inflight[future] = (stem, pair)
+
+    def _collect(self):
+        for future in [f for f in self._inflight if f.done()]:
+            stem, pair = self._inflight.pop(future)
+            try:
+                out_path = future.result()
+                target = self.processed
+                self.done += 1
+                self.log(f"✓ {stem} -> {out_path}")
+            except Exception as e:
+                target = self.failed_dir
+                self.errors += 1
+                self.log(f"HATA {stem}: {e}")
+            for name in pair.values():
+                try:
+                    os.replace(self.inbox / name, target / name)
+                except OSError as e:
+                    self.log(f"Taşınamadı {name}: {e}")
+                self._claimed.discard(name)
+
+    def run(self, stop=None):
+        """`stop` (threading.Event benzeri) set edilene ya da Ctrl+C'ye kadar çalışır."""
+        for d in (self.outbox, self.processed, self.failed_dir):
+            d.mkdir(parents=True, exist_ok=True)
+
+        source = self._open_source()
+        self.log(f"İzleniyor: {self.inbox} -> {self.outbox} ({type(source).__name__[1:]}, {self.workers} işçi)")
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                self._rescan(time.monotonic())
+                while stop is None or not stop.is_set():
+                    now = time.monotonic()
+                    timeout = self.poll_interval
+                    if self._heap:
+                        timeout = min(timeout, self._heap[0][0] - now)
+                    if self._inflight:
+                        timeout = min(timeout, 0.05)
+
+                    names = source.wait(timeout)
+                    now = time.monotonic()
+                    if names is None:
+                        self.log("inotify kuyruğu taştı; klasör yeniden taranıyor.")
+                        self._rescan(now)
+                    else:
+                        for name in names:
+                            self._touch(name, now)
+
+                    self._promote(now)
+                    self._submit(pool)
+                    self._collect()
+
+                # Durdurulurken yoldaki işler bitirilip girdileri taşınır
+                wait(self._inflight)
+                self._collect()
+        except KeyboardInterrupt:
+            self.log("Durduruluyor…")
+        finally:
+            source.close()
+        return 0